@@ -8,13 +8,30 @@ Routes to subcommands: rtree, locr, gitmig.
 from __future__ import annotations
 
 import argparse
+import importlib
 import sys
+from typing import List, Optional
 
-from gtrmrs import __version__
+# Subcommand name -> module providing add_parser(subparsers)
+SUBCOMMANDS = {
+    "rtree": "gtrmrs.rtree.cli",
+    "locr": "gtrmrs.locr.cli",
+    "gitmig": "gtrmrs.gitmig.cli",
+}
 
 
-def main() -> None:
+def _version() -> str:
+    """Return the version string for --version."""
+    from gtrmrs import __version__
+
+    return f"gtrmrs {__version__}"
+
+
+def main(argv: Optional[List[str]] = None) -> None:
     """Main entry point for gtrmrs command."""
+    if argv is None:
+        argv = sys.argv[1:]
+
     parser = argparse.ArgumentParser(
         prog="gtrmrs",
         description="Unified CLI tools for Git repository management.",
@@ -22,7 +39,7 @@ def main() -> None:
     parser.add_argument(
         "--version",
         action="version",
-        version=f"gtrmrs {__version__}",
+        version=_version(),
     )
 
     subparsers = parser.add_subparsers(
@@ -31,17 +48,15 @@ def main() -> None:
         description="Available subcommands",
     )
 
-    # Register subcommands
-    from gtrmrs.rtree.cli import add_parser as add_rtree
-    from gtrmrs.locr.cli import add_parser as add_locr
-    from gtrmrs.gitmig.cli import add_parser as add_gitmig
-
-    add_rtree(subparsers)
-    add_locr(subparsers)
-    add_gitmig(subparsers)
+    # Register subcommands. When the first argument names one, only that
+    # module (and its engine) is imported; help and errors need them all
+    selected = argv[0] if argv and argv[0] in SUBCOMMANDS else None
+    for name, module in SUBCOMMANDS.items():
+        if selected is None or name == selected:
+            importlib.import_module(module).add_parser(subparsers)
 
     # Parse arguments
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     if args.command is None:
         parser.print_help()
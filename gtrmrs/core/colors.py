@@ -5,6 +5,10 @@ ANSI color utilities for terminal output.
 Shared across rtree, locr, and gitmig subcommands.
 """
 
+import os
+import sys
+from typing import BinaryIO, Tuple
+
 
 class Colors:
     """ANSI color codes for terminal output."""
@@ -26,9 +30,77 @@ class Colors:
     HIDE_CURSOR = "\033[?25l"
     SHOW_CURSOR = "\033[?25h"
 
+    # Byte variants for Colors.write()
+    RESET_B = RESET.encode()
+    GREY_B = GREY.encode()
+    RED_B = RED.encode()
+    GREEN_B = GREEN.encode()
+    YELLOW_B = YELLOW.encode()
+    BLUE_B = BLUE.encode()
+    CYAN_B = CYAN.encode()
+
     @staticmethod
     def style(text: str, color: str, enabled: bool = True) -> str:
         """Apply ANSI color to text if enabled."""
         if not enabled:
             return text
         return f"{color}{text}{Colors.RESET}"
+
+    @staticmethod
+    def codes(color: str, enabled: bool = True) -> Tuple[str, str]:
+        """
+        Return the (start, end) codes style() would wrap text in.
+        
+        For hot loops styling many strings alike: concatenating the pair
+        resolved once per render avoids a call per string.
+        """
+        if not enabled:
+            return "", ""
+        return color, Colors.RESET
+
+    @staticmethod
+    def write(
+        stream: BinaryIO,
+        text: str,
+        color: bytes = b"",
+        enabled: bool = True,
+        encoding: str = "utf-8",
+    ) -> None:
+        """
+        Write text as one line to a binary stream (e.g. sys.stdout.buffer).
+        
+        Meant for per-file output: no styled str is built and print() is
+        bypassed. Flush the text stream first to keep output ordered.
+        """
+        if enabled and color:
+            stream.write(color)
+            stream.write(text.encode(encoding, "replace"))
+            stream.write(Colors.RESET_B + b"\n")
+        else:
+            stream.write(text.encode(encoding, "replace") + b"\n")
+
+
+# Decided once at import: color only makes sense on an interactive
+# terminal, and a non-empty NO_COLOR (https://no-color.org) turns it off
+_USE_COLOR = (
+    sys.stdout is not None
+    and sys.stdout.isatty()
+    and not os.environ.get("NO_COLOR")
+)
+
+if not _USE_COLOR:
+    # Swap in no-op variants so hot callers skip building escapes entirely
+    _write_plain = Colors.write
+
+    def _write_no_color(
+        stream: BinaryIO,
+        text: str,
+        color: bytes = b"",
+        enabled: bool = True,
+        encoding: str = "utf-8",
+    ) -> None:
+        _write_plain(stream, text, b"", False, encoding)
+
+    Colors.style = staticmethod(lambda text, color, enabled=True: text)
+    Colors.codes = staticmethod(lambda color, enabled=True: ("", ""))
+    Colors.write = staticmethod(_write_no_color)
@@ -9,18 +9,218 @@ Provides the 2-phase hybrid scanning logic shared by rtree, locr, and gitmig:
 
 from __future__ import annotations
 
-import fnmatch
 import os
+import re
+import shutil
+import stat
 import subprocess
-from typing import Callable, List, Optional, Set, Tuple
+import sys
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import (
+    Callable, Deque, Dict, FrozenSet, List, NamedTuple, Optional, Pattern, Set,
+    Tuple, Union,
+)
 
-from gtrmrs.core.patterns import EXCLUDE_DIRS
+from gtrmrs.core.patterns import (
+    EXCLUDE_DIRS_GLOB_RE,
+    EXCLUDE_DIRS_LITERAL,
+    GLOB_CHARS,
+    split_patterns,
+)
 
 
+@lru_cache(maxsize=1024)
 def is_git_repo(path: str) -> bool:
-    """Check if the given path is inside a Git repository."""
-    git_dir = os.path.join(path, ".git")
-    return os.path.isdir(git_dir)
+    """
+    Check if the given path is inside a Git repository.
+    
+    A single lstat tells a regular worktree (`.git` directory) apart from a
+    submodule or linked worktree (`.git` file with a `gitdir:` pointer).
+    Results are cached per path.
+    """
+    git_path = os.path.join(path, ".git")
+    try:
+        st = os.lstat(git_path)
+    except OSError:
+        return False
+    
+    if stat.S_ISDIR(st.st_mode):
+        return True
+    if stat.S_ISREG(st.st_mode):
+        try:
+            with open(git_path, "r", encoding="utf-8") as f:
+                return f.readline().startswith("gitdir:")
+        except (OSError, UnicodeDecodeError):
+            return False
+    if stat.S_ISLNK(st.st_mode):
+        return os.path.isdir(git_path)
+    return False
+
+
+@lru_cache(maxsize=1)
+def _git_executable() -> Optional[str]:
+    """Resolve the git executable once instead of on every subprocess call."""
+    return shutil.which("git")
+
+
+# Pipe transfer size for git check-ignore sessions
+_PIPE_CHUNK = 65536
+
+
+def _is_safe_path(relpath: str) -> bool:
+    """Reject paths with null bytes or control characters."""
+    return "\0" not in relpath and all(ord(c) >= 32 or c in "\t\n" for c in relpath)
+
+
+class GitCheckIgnoreSession:
+    """
+    Long-lived `git check-ignore --stdin -z` process for one repository.
+    
+    Paths can be fed in batches while a walk is still running, so Git works
+    in parallel with the traversal instead of after it. A reader thread
+    drains stdout continuously, which keeps either pipe from filling up.
+    Both pipes are unbuffered and moved in 64 KiB chunks, and output is
+    split into records as it arrives instead of being held as one blob.
+    
+    Usage:
+        with GitCheckIgnoreSession(repo_path) as session:
+            session.add(relpaths)
+        ignored = session.ignored
+    """
+
+    def __init__(self, repo_path: str, timeout: float = 30):
+        self.repo_path = repo_path
+        self.timeout = timeout
+        self.ignored: Set[str] = set()
+        self._proc: Optional[subprocess.Popen] = None
+        self._reader: Optional[threading.Thread] = None
+        self._found: Set[bytes] = set()
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "GitCheckIgnoreSession":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def start(self) -> None:
+        """Spawn the Git process and the stdout reader thread."""
+        git = _git_executable()
+        if git is None:
+            # Git not available
+            return
+        
+        try:
+            # Use null-delimited protocol (-z) for safer parsing
+            self._proc = subprocess.Popen(
+                [git, "check-ignore", "--stdin", "-z"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                cwd=self.repo_path,
+                bufsize=0,
+            )
+        except (OSError, subprocess.SubprocessError):
+            # Git not available
+            self._proc = None
+            return
+        
+        self._reader = threading.Thread(target=self._drain, daemon=True)
+        self._reader.start()
+
+    def _drain(self) -> None:
+        """Collect NUL-terminated records from stdout until Git exits."""
+        fd = self._proc.stdout.fileno()
+        found = self._found
+        pending = bytearray()
+        while True:
+            chunk = os.read(fd, _PIPE_CHUNK)
+            if not chunk:
+                break
+            pending += chunk
+            end = pending.rfind(b"\0")
+            if end < 0:
+                continue
+            # Keep the incomplete tail for the next read
+            found.update(bytes(pending[:end]).split(b"\0"))
+            del pending[:end + 1]
+        found.discard(b"")
+
+    def add(self, relpaths: List[str]) -> None:
+        """Feed a batch of relative paths to Git. Safe to call from threads."""
+        if self._proc is None or not relpaths:
+            return
+        
+        data = b"".join(
+            os.fsencode(p) + b"\0" for p in relpaths if _is_safe_path(p)
+        )
+        if not data:
+            return
+        with self._lock:
+            if self._proc is None:
+                return
+            try:
+                fd = self._proc.stdin.fileno()
+                view = memoryview(data)
+                while view:
+                    written = os.write(fd, view[:_PIPE_CHUNK])
+                    view = view[written:]
+            except (BrokenPipeError, OSError):
+                # Git exited early (e.g. not a repository)
+                self._abort()
+
+    def _abort(self) -> None:
+        """Stop the process and discard any partial results."""
+        proc = self._proc
+        self._proc = None
+        self._found = set()
+        if proc is not None:
+            proc.kill()
+            proc.wait()
+            if self._reader is not None:
+                self._reader.join()
+            for pipe in (proc.stdin, proc.stdout):
+                try:
+                    pipe.close()
+                except OSError:
+                    pass
+
+    def close(self) -> Set[str]:
+        """Finish the session and return the set of ignored paths."""
+        proc = self._proc
+        if proc is None:
+            return self.ignored
+        
+        self._proc = None
+        try:
+            proc.stdin.close()
+        except (BrokenPipeError, OSError):
+            pass
+        
+        try:
+            returncode = proc.wait(timeout=self.timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            returncode = None
+        if self._reader is not None:
+            self._reader.join()
+        proc.stdout.close()
+        
+        if returncode in (0, 1) and self._found:
+            # Decode lazily, only the (usually few) ignored paths, and in
+            # one call: NUL never occurs inside a path or a multibyte
+            # sequence, so joining on it keeps every record intact
+            joined = b"\0".join(self._found).decode(
+                sys.getfilesystemencoding(), sys.getfilesystemencodeerrors()
+            )
+            self.ignored = set(joined.split("\0"))
+        self._found = set()
+        return self.ignored
 
 
 def git_check_ignore(repo_path: str, relpaths: List[str]) -> Set[str]:
@@ -37,32 +237,9 @@ def git_check_ignore(repo_path: str, relpaths: List[str]) -> Set[str]:
     if not relpaths:
         return set()
     
-    # Sanitize paths: filter out any with null bytes or control characters
-    safe_paths = [
-        p for p in relpaths
-        if "\0" not in p and all(ord(c) >= 32 or c in "\t\n" for c in p)
-    ]
-    
-    if not safe_paths:
-        return set()
-    
-    try:
-        # Use null-delimited protocol (-z) for safer parsing
-        input_bytes = "\0".join(safe_paths).encode("utf-8")
-        proc = subprocess.run(
-            ["git", "check-ignore", "--stdin", "-z"],
-            input=input_bytes,
-            capture_output=True,
-            cwd=repo_path,
-            timeout=30,
-        )
-        if proc.returncode not in (0, 1) or not proc.stdout:
-            return set()
-        parts = [p.decode("utf-8") for p in proc.stdout.split(b"\0") if p]
-        return set(parts)
-    except (subprocess.SubprocessError, FileNotFoundError):
-        # Git not available or error occurred
-        return set()
+    with GitCheckIgnoreSession(repo_path) as session:
+        session.add(relpaths)
+    return session.ignored
 
 
 def compile_gitignore_patterns(gitignore_path: str) -> List[Tuple[str, bool, bool]]:
@@ -80,7 +257,8 @@ def compile_gitignore_patterns(gitignore_path: str) -> List[Tuple[str, bool, boo
     try:
         with open(gitignore_path, "r", encoding="utf-8") as f:
             for line in f:
-                line = line.strip()
+                # Git keeps leading whitespace as part of the pattern
+                line = line.rstrip()
                 
                 # Skip empty lines and comments
                 if not line or line.startswith("#"):
@@ -101,9 +279,253 @@ def compile_gitignore_patterns(gitignore_path: str) -> List[Tuple[str, bool, boo
     return patterns
 
 
+def gitignore_literal_extensions(
+    patterns: List[Tuple[str, bool, bool]]
+) -> FrozenSet[str]:
+    """
+    Extract extensions from plain `*.ext` rules (e.g. `*.log`, `*.pyc`).
+    
+    A file whose extension is in this set is ignored regardless of where it
+    lives, so it can be decided without a Git roundtrip. Negation rules can
+    re-include such files, so none are returned if any are present.
+    Unlike `git check-ignore`, this knows neither tracked files nor nested
+    `.gitignore` files, so such hits have to go back to Git.
+    
+    Returns:
+        Set of extensions without the leading dot
+    """
+    exts = set()
+    for pattern, is_negation, is_dir_only in patterns:
+        if is_negation:
+            return frozenset()
+        if is_dir_only or not pattern.startswith("*."):
+            continue
+        ext = pattern[2:]
+        if ext and "." not in ext and "/" not in ext and not any(c in ext for c in GLOB_CHARS):
+            exts.add(ext)
+    return frozenset(exts)
+
+
+class CompiledGitignore(NamedTuple):
+    """Gitignore rules compiled into one regex union per path type."""
+
+    file_re: Optional[Pattern[str]]
+    dir_re: Optional[Pattern[str]]
+    negations: Tuple[bool, ...]
+    # Whether a match also covers everything below a matched directory;
+    # False for rule sets with negations, whose parents are checked apart
+    descendants: bool = True
+
+
+# Path separators accepted in relative paths on this platform
+_SEP = r"[/\\]" if os.name == "nt" else "/"
+_NOT_SEP = r"[^/\\]" if os.name == "nt" else "[^/]"
+# The same separators for use inside a regex set
+_SEP_CHARS = r"/\\" if os.name == "nt" else "/"
+
+
+# POSIX character classes allowed inside gitignore brackets, as regex sets
+_POSIX_CLASSES = {
+    "alnum": "0-9A-Za-z",
+    "alpha": "A-Za-z",
+    "blank": " \\t",
+    "cntrl": "\\x00-\\x1f\\x7f",
+    "digit": "0-9",
+    "graph": "\\x21-\\x7e",
+    "lower": "a-z",
+    "print": "\\x20-\\x7e",
+    "punct": "!-/:-@\\[-`{-~",
+    "space": " \\t\\n\\r\\f\\v",
+    "upper": "A-Z",
+    "xdigit": "0-9A-Fa-f",
+}
+
+# Regex for a gitignore glob Git refuses to match anything with
+_NEVER = "(?!)"
+
+
+def _translate_class(segment: str, i: int) -> Tuple[str, int]:
+    """
+    Translate the bracket expression opening at `segment[i - 1]`.
+    
+    Follows Git's wildmatch: `!` or `^` negates, a leading `]` is literal,
+    backslash escapes, `[:name:]` is a POSIX class, and no class ever
+    matches a path separator. A malformed expression matches nothing.
+    
+    Returns:
+        (regex, index after the closing bracket)
+    """
+    n = len(segment)
+    negated = i < n and segment[i] in "!^"
+    if negated:
+        i += 1
+    items = []
+    prev = ""
+    first = True
+    while True:
+        if i >= n:
+            return _NEVER, n
+        c = segment[i]
+        if c == "]" and not first:
+            break
+        first = False
+        if c == "\\":
+            i += 1
+            if i >= n:
+                return _NEVER, n
+            c = segment[i]
+            items.append(re.escape(c))
+        elif c == "-" and prev and i + 1 < n and segment[i + 1] != "]":
+            i += 1
+            hi = segment[i]
+            if hi == "\\":
+                i += 1
+                if i >= n:
+                    return _NEVER, n
+                hi = segment[i]
+            if prev <= hi:
+                items.append(f"{re.escape(prev)}-{re.escape(hi)}")
+            # A range ends the run: "a-c-e" is a-c, then "-", then "e"
+            i += 1
+            prev = ""
+            continue
+        elif c == "[" and segment.startswith(":", i + 1):
+            close = segment.find("]", i + 2)
+            if close < 0:
+                return _NEVER, n
+            if close - 1 < i + 2 or segment[close - 1] != ":":
+                # No ":]" before the next "]": an ordinary "["
+                items.append(re.escape(c))
+            else:
+                posix = _POSIX_CLASSES.get(segment[i + 2:close - 1])
+                if posix is None:
+                    return _NEVER, n
+                items.append(posix)
+                i = close + 1
+                prev = ""
+                continue
+        else:
+            items.append(re.escape(c))
+        prev = c
+        i += 1
+    body = "".join(items)
+    if negated:
+        return f"[^{body}{_SEP_CHARS}]", i + 1
+    return f"(?!{_SEP})[{body}]", i + 1
+
+
+def _translate_segment(segment: str) -> str:
+    """Translate one path component of a gitignore glob to a regex."""
+    out = []
+    i, n = 0, len(segment)
+    while i < n:
+        c = segment[i]
+        i += 1
+        if c == "*":
+            out.append(_NOT_SEP + "*")
+        elif c == "?":
+            out.append(_NOT_SEP)
+        elif c == "\\" and i < n:
+            out.append(re.escape(segment[i]))
+            i += 1
+        elif c == "[":
+            regex, i = _translate_class(segment, i)
+            out.append(regex)
+        else:
+            out.append(re.escape(c))
+    return "".join(out)
+
+
+def _translate_gitignore(pattern: str) -> str:
+    """
+    Translate a gitignore glob (gitwildmatch rules) to a regex prefix.
+    
+    A pattern with a slash is anchored to the root, otherwise it may match
+    at any depth. `**/` matches zero or more directories and a trailing
+    `/**` everything inside. The result matches the path itself; callers
+    append what may follow it.
+    """
+    anchored = "/" in pattern
+    if pattern.startswith("/"):
+        pattern = pattern[1:]
+    parts = pattern.split("/")
+    
+    out = [] if anchored else [rf"(?:(?s:.*){_SEP})?"]
+    last = len(parts) - 1
+    for index, part in enumerate(parts):
+        if part == "**":
+            if index == last:
+                out.append(r"(?s:.+)")
+            else:
+                out.append(rf"(?:(?s:.*){_SEP})?")
+            continue
+        out.append(_translate_segment(part))
+        if index != last:
+            out.append(_SEP)
+    return "".join(out)
+
+
+def compile_gitignore_regex(
+    patterns: List[Tuple[str, bool, bool]]
+) -> CompiledGitignore:
+    """
+    Compile parsed gitignore rules into a single regex per path type.
+    
+    Rules follow Git's wildmatch semantics (anchoring, `**`, character
+    classes), and a rule matching a directory also matches everything
+    below it. Each rule becomes one named group; rules are emitted in
+    reverse, so the first alternative that matches is the last rule in
+    the file, which is the one Git honours.
+    
+    With negations that shortcut breaks: a `!` rule must not re-include
+    anything below a directory Git still excludes. Such rule sets match
+    each path by itself instead (`descendants` is False), and
+    simple_gitignore_match() checks the parent directories first.
+    
+    Args:
+        patterns: Tuples from compile_gitignore_patterns()
+    
+    Returns:
+        CompiledGitignore for use with simple_gitignore_match()
+    """
+    file_parts = []
+    dir_parts = []
+    negations = [is_negation for _, is_negation, _ in patterns]
+    descendants = not any(negations)
+    below = rf"{_SEP}(?s:.*)"
+    
+    for index, (pattern, _, is_dir_only) in enumerate(patterns):
+        body = _translate_gitignore(pattern)
+        if not descendants:
+            dir_parts.append(rf"(?P<r{index}>{body}\Z)")
+            # Dir-only rules never match a file by itself
+            if not is_dir_only:
+                file_parts.append(rf"(?P<r{index}>{body}\Z)")
+            continue
+        dir_parts.append(rf"(?P<r{index}>{body}(?:{below})?\Z)")
+        # Dir-only rules reach files only through a parent directory
+        suffix = below if is_dir_only else rf"(?:{below})?"
+        file_parts.append(rf"(?P<r{index}>{body}{suffix}\Z)")
+    
+    def _union(parts: List[str]) -> Optional[Pattern[str]]:
+        return re.compile("|".join(reversed(parts))) if parts else None
+    
+    return CompiledGitignore(
+        _union(file_parts), _union(dir_parts), tuple(negations), descendants
+    )
+
+
+@lru_cache(maxsize=32)
+def _compile_gitignore_cached(
+    patterns: Tuple[Tuple[str, bool, bool], ...]
+) -> CompiledGitignore:
+    """compile_gitignore_regex() for callers passing raw tuples per call."""
+    return compile_gitignore_regex(list(patterns))
+
+
 def simple_gitignore_match(
     relpath: str,
-    patterns: List[Tuple[str, bool, bool]],
+    patterns: Union[CompiledGitignore, List[Tuple[str, bool, bool]]],
     is_dir: bool = False
 ) -> bool:
     """
@@ -111,27 +533,368 @@ def simple_gitignore_match(
     
     Args:
         relpath: Relative path to check
-        patterns: Compiled gitignore patterns
+        patterns: CompiledGitignore, or raw pattern tuples (compiled and
+            cached on first use)
         is_dir: Whether the path is a directory
     
     Returns:
         True if the path should be ignored
     """
-    ignored = False
+    if not isinstance(patterns, CompiledGitignore):
+        if not patterns:
+            return False
+        patterns = _compile_gitignore_cached(tuple(patterns))
     
-    for pattern, is_negation, is_dir_only in patterns:
-        # Skip dir-only patterns for files
-        if is_dir_only and not is_dir:
-            continue
+    if not patterns.descendants and patterns.dir_re is not None:
+        # Git cannot re-include a path below an excluded directory, so
+        # every parent directory is checked first, top-down
+        probe = relpath.replace("\\", "/") if os.name == "nt" else relpath
+        end = probe.find("/")
+        while end >= 0:
+            if _match_rules(relpath[:end], patterns.dir_re, patterns.negations):
+                return True
+            end = probe.find("/", end + 1)
+    
+    regex = patterns.dir_re if is_dir else patterns.file_re
+    if regex is None:
+        return False
+    return _match_rules(relpath, regex, patterns.negations)
+
+
+def _match_rules(
+    relpath: str, regex: Pattern[str], negations: Tuple[bool, ...]
+) -> bool:
+    """Apply one compiled rule union to `relpath`."""
+    match = regex.match(relpath)
+    if match is None:
+        return False
+    # The matching group is the last rule that applies
+    return not negations[int(match.lastgroup[1:])]
+
+
+# Spellings of a true boolean in Git config files
+_GIT_TRUE = ("", "true", "yes", "on", "1")
+
+
+def _read_core_excludes_file(config_path: str) -> Optional[str]:
+    """Return `core.excludesFile` from a Git config file, if set there."""
+    value = _read_core_option(config_path, "excludesfile")
+    return os.path.expanduser(value) if value else None
+
+
+def _read_core_option(config_path: str, key_name: str) -> Optional[str]:
+    """Return a `core.<key_name>` value (lowercase name) from a Git config file."""
+    value = None
+    section = ""
+    try:
+        with open(config_path, "r", encoding="utf-8", errors="ignore") as f:
+            for line in f:
+                line = line.strip()
+                if not line or line[0] in "#;":
+                    continue
+                if line.startswith("["):
+                    section = line.strip("[]").strip().lower()
+                    continue
+                key, _, raw = line.partition("=")
+                if section == "core" and key.strip().lower() == key_name:
+                    value = raw.strip().strip('"')
+    except OSError:
+        return None
+    return value
+
+
+@lru_cache(maxsize=1)
+def _global_excludes_file() -> str:
+    """
+    Resolve the user's global excludes file the way Git does.
+    
+    `core.excludesFile` in ~/.gitconfig wins over the XDG config; without
+    either, Git falls back to $XDG_CONFIG_HOME/git/ignore.
+    """
+    xdg_home = os.environ.get("XDG_CONFIG_HOME") or os.path.expanduser(
+        os.path.join("~", ".config")
+    )
+    for config_path in (
+        os.path.expanduser(os.path.join("~", ".gitconfig")),
+        os.path.join(xdg_home, "git", "config"),
+    ):
+        path = _read_core_excludes_file(config_path)
+        if path:
+            return path
+    return os.path.join(xdg_home, "git", "ignore")
+
+
+# Environment variables that make Git read config files not looked at here
+_GIT_CONFIG_ENV = (
+    "GIT_CONFIG_GLOBAL", "GIT_CONFIG_SYSTEM", "GIT_CONFIG_COUNT",
+    "GIT_CONFIG_PARAMETERS",
+)
+
+
+def _config_has_includes(config_path: str) -> bool:
+    """Return True if a Git config file has `[include]` or `[includeIf]` sections."""
+    try:
+        with open(config_path, "r", encoding="utf-8", errors="ignore") as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith("[") and line[1:].lstrip().lower().startswith("include"):
+                    return True
+    except OSError:
+        return False
+    return False
+
+
+@lru_cache(maxsize=1)
+def _user_config_ambiguous() -> bool:
+    """
+    Return True if Git may use another excludes file than `_global_excludes_file()`.
+    
+    That is the case when environment variables add config, when the
+    system config sets `core.excludesFile`, or when a config file pulls
+    in others whose settings aren't read here.
+    """
+    if any(name in os.environ for name in _GIT_CONFIG_ENV):
+        return True
+    system_config = os.path.join(os.sep, "etc", "gitconfig")
+    if _read_core_excludes_file(system_config) or _config_has_includes(system_config):
+        return True
+    xdg_home = os.environ.get("XDG_CONFIG_HOME") or os.path.expanduser(
+        os.path.join("~", ".config")
+    )
+    return any(
+        _config_has_includes(config_path)
+        for config_path in (
+            os.path.expanduser(os.path.join("~", ".gitconfig")),
+            os.path.join(xdg_home, "git", "config"),
+        )
+    )
+
+
+def _excludes_config_ambiguous(repo_path: str) -> bool:
+    """Return True if Git may read excludes files `_root_gitignore_patterns` doesn't."""
+    if _user_config_ambiguous():
+        return True
+    common_dir = _git_common_dir(repo_path)
+    return common_dir is not None and _config_has_includes(
+        os.path.join(common_dir, "config")
+    )
+
+
+def _git_common_dir(repo_path: str) -> Optional[str]:
+    """Locate the directory holding `info/exclude` for a worktree."""
+    git_path = os.path.join(repo_path, ".git")
+    if os.path.isdir(git_path):
+        return git_path
+    try:
+        with open(git_path, "r", encoding="utf-8") as f:
+            line = f.readline().strip()
+    except (OSError, UnicodeDecodeError):
+        return None
+    if not line.startswith("gitdir:"):
+        return None
+    git_dir = os.path.join(repo_path, line[len("gitdir:"):].strip())
+    # Linked worktrees share info/exclude with the main repository
+    try:
+        with open(os.path.join(git_dir, "commondir"), "r", encoding="utf-8") as f:
+            return os.path.normpath(os.path.join(git_dir, f.readline().strip()))
+    except (OSError, UnicodeDecodeError):
+        return git_dir
+
+
+def _root_gitignore_patterns(
+    repo_path: str, git_excludes: bool = True
+) -> Tuple[List[Tuple[str, bool, bool]], bool]:
+    """
+    Collect the rules that apply from the repository root down.
+    
+    These are the global excludes file, `.git/info/exclude` and the root
+    `.gitignore`, in increasing precedence (the first two only with
+    `git_excludes`).
+    
+    Returns:
+        Tuple of (pattern tuples, whether core.ignorecase is set)
+    """
+    patterns: List[Tuple[str, bool, bool]] = []
+    ignorecase = False
+    if git_excludes:
+        common_dir = _git_common_dir(repo_path)
+        excludes_file = None
+        if common_dir is not None:
+            config_path = os.path.join(common_dir, "config")
+            # A repository's own core.excludesFile wins over the user's
+            excludes_file = _read_core_excludes_file(config_path)
+            value = _read_core_option(config_path, "ignorecase")
+            # A bare key is true as well
+            ignorecase = value is not None and value.lower() in _GIT_TRUE
+        patterns.extend(compile_gitignore_patterns(
+            excludes_file or _global_excludes_file()
+        ))
+        if common_dir is not None:
+            patterns.extend(compile_gitignore_patterns(
+                os.path.join(common_dir, "info", "exclude")
+            ))
+    patterns.extend(compile_gitignore_patterns(os.path.join(repo_path, ".gitignore")))
+    return patterns, ignorecase
+
+
+def _git_ls_files(repo_path: str, args: List[str]) -> Optional[List[str]]:
+    """
+    Run `git ls-files -z` with `args` and return its paths ("/" separated).
+    
+    Returns:
+        List of paths, or None if Git could not be asked
+    """
+    git = _git_executable()
+    if git is None:
+        return None
+    try:
+        result = subprocess.run(
+            [git, "ls-files", "-z"] + args,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            cwd=repo_path,
+            timeout=30,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if result.returncode != 0:
+        return None
+    return [p for p in os.fsdecode(result.stdout).split("\0") if p]
+
+
+def git_tracked_ignored(repo_path: str) -> Optional[Set[str]]:
+    """
+    List tracked files that match an ignore rule.
+    
+    `git check-ignore` never reports these, so a walk that prunes by
+    ignore rules alone has to add them back.
+    
+    Args:
+        repo_path: Root of the Git repository
+    
+    Returns:
+        Set of relative paths with "/" separators, or None if Git could
+        not be asked
+    """
+    paths = _git_ls_files(repo_path, ["--cached", "--ignored", "--exclude-standard"])
+    return None if paths is None else set(paths)
+
+
+def _extension_hits_for_git(
+    repo_path: str,
+    hits: Set[str],
+    files: List[str],
+    literal_exts: FrozenSet[str],
+) -> Set[str]:
+    """
+    Pick the `*.ext` shortcut hits that Git has to decide after all.
+    
+    The shortcut knows neither which files are tracked, which Git never
+    reports as ignored, nor the negations of nested `.gitignore` files
+    found during the walk. Hits that are tracked or lie below a nested
+    `.gitignore` with a `!` rule are returned; every hit is if Git
+    cannot list the tracked files.
+    """
+    paths = _git_ls_files(repo_path, ["--"] + sorted(f"*.{ext}" for ext in literal_exts))
+    if paths is None:
+        return set(hits)
+    tracked = set(paths) if os.sep == "/" else {p.replace("/", os.sep) for p in paths}
+    
+    nested = os.sep + ".gitignore"
+    negated = tuple(
+        relpath[:-len(".gitignore")]
+        for relpath in files
+        if relpath.endswith(nested)
+        and any(
+            is_negation
+            for _, is_negation, _ in compile_gitignore_patterns(
+                os.path.join(repo_path, relpath)
+            )
+        )
+    )
+    return {
+        p for p in hits if p in tracked or (negated and p.startswith(negated))
+    }
+
+
+class GitignoreMatcher:
+    """
+    In-process gitignore matching for one repository, without Git.
+    
+    Root rules combine the global excludes file, `.git/info/exclude` and
+    the root `.gitignore`, in increasing precedence (the first two only
+    with `git_excludes`). Nested `.gitignore`
+    files are loaded with load_dir() as a walk enters each directory and
+    override the rules above them. Paths are relative to the repository
+    and use os.sep.
+    
+    Unlike `git check-ignore`, this does not know which files are tracked,
+    so its hits should be confirmed with Git where that matters. `exact`
+    stays True while every rule loaded so far reads the same here as in
+    Git; it turns False on backslash escapes (whose trailing-space and
+    literal-character rules aren't modelled), on bracket expressions, on
+    leading whitespace, on `core.ignorecase`, on config includes that
+    may name another excludes file and on negations. A `!` rule is
+    matched against the path alone, so it only reads right for paths
+    whose parents the walk already let through.
+    """
+
+    def __init__(self, repo_path: str, git_excludes: bool = True):
+        self.repo_path = repo_path
+        self.exact = True
+        # Relative dir prefix ("" for the root, else ending in os.sep) -> rules
+        self._levels: Dict[str, CompiledGitignore] = {}
         
-        # Match against basename or full path
-        basename = os.path.basename(relpath)
-        matches = fnmatch.fnmatch(basename, pattern) or fnmatch.fnmatch(relpath, pattern)
+        patterns, ignorecase = _root_gitignore_patterns(repo_path, git_excludes)
+        if ignorecase or (git_excludes and _excludes_config_ambiguous(repo_path)):
+            self.exact = False
+        if patterns:
+            self._levels[""] = self._compile(patterns)
+
+    def load_dir(self, rel_dir: str, dir_path: Optional[str] = None) -> None:
+        """
+        Load the `.gitignore` of a subdirectory, if it has one.
         
-        if matches:
-            ignored = not is_negation
-    
-    return ignored
+        Args:
+            rel_dir: Relative directory path ending in os.sep
+            dir_path: Absolute directory path (derived if omitted)
+        """
+        if not rel_dir:
+            return
+        if dir_path is None:
+            dir_path = os.path.join(self.repo_path, rel_dir)
+        patterns = compile_gitignore_patterns(os.path.join(dir_path, ".gitignore"))
+        if patterns:
+            self._levels[rel_dir] = self._compile(patterns)
+
+    def _compile(self, patterns: List[Tuple[str, bool, bool]]) -> CompiledGitignore:
+        """Compile one level's rules, noting any this matcher may misread."""
+        if self.exact and any(
+            is_negation or "\\" in pattern or "[" in pattern or pattern[:1].isspace()
+            for pattern, is_negation, _ in patterns
+        ):
+            self.exact = False
+        return compile_gitignore_regex(patterns)
+
+    def match(self, relpath: str, is_dir: bool = False) -> bool:
+        """Return True if `relpath` is ignored by the loaded rules."""
+        levels = self._levels
+        if not levels:
+            return False
+        sep = os.sep
+        end = relpath.rfind(sep)
+        # The deepest .gitignore with an opinion decides
+        while True:
+            prefix = relpath[:end + 1] if end >= 0 else ""
+            patterns = levels.get(prefix)
+            if patterns is not None:
+                regex = patterns.dir_re if is_dir else patterns.file_re
+                found = regex.match(relpath, len(prefix)) if regex is not None else None
+                if found is not None:
+                    return not patterns.negations[int(found.lastgroup[1:])]
+            if end < 0:
+                return False
+            end = relpath.rfind(sep, 0, end)
 
 
 def should_eager_prune(dirname: str, extra_excludes: Optional[List[str]] = None) -> bool:
@@ -146,21 +909,177 @@ def should_eager_prune(dirname: str, extra_excludes: Optional[List[str]] = None)
         True if the directory should be skipped entirely
     """
     # Check against default exclude patterns
-    for pattern in EXCLUDE_DIRS:
-        if fnmatch.fnmatch(dirname, pattern):
-            return True
+    if dirname in EXCLUDE_DIRS_LITERAL:
+        return True
+    if EXCLUDE_DIRS_GLOB_RE is not None and EXCLUDE_DIRS_GLOB_RE.match(dirname):
+        return True
     
     # Check against extra excludes
     if extra_excludes:
-        for pattern in extra_excludes:
-            # Handle both "dir/" and "dir" patterns
-            clean_pattern = pattern.rstrip("/")
-            if fnmatch.fnmatch(dirname, clean_pattern):
-                return True
+        literals, glob_re = _compile_extra_excludes(tuple(extra_excludes))
+        if dirname in literals:
+            return True
+        if glob_re is not None and glob_re.match(dirname):
+            return True
     
     return False
 
 
+@lru_cache(maxsize=32)
+def _compile_extra_excludes(
+    extra_excludes: Tuple[str, ...],
+) -> Tuple[FrozenSet[str], Optional[Pattern[str]]]:
+    """Compile extra exclude patterns once per distinct exclude list."""
+    # Handle both "dir/" and "dir" patterns
+    return split_patterns(p.rstrip("/") for p in extra_excludes)
+
+
+# Directory names pruned by the walk: (literal names, merged glob regex)
+_PruneRules = Tuple[FrozenSet[str], Optional[Pattern[str]]]
+
+
+def _compile_prune_rules(extra_excludes: Optional[List[str]]) -> _PruneRules:
+    """Merge the default and extra directory excludes for one walk."""
+    if not extra_excludes:
+        return EXCLUDE_DIRS_LITERAL, EXCLUDE_DIRS_GLOB_RE
+    literals, glob_re = _compile_extra_excludes(tuple(extra_excludes))
+    if EXCLUDE_DIRS_GLOB_RE is not None and glob_re is not None:
+        glob_re = re.compile(f"{EXCLUDE_DIRS_GLOB_RE.pattern}|{glob_re.pattern}")
+    elif glob_re is None:
+        glob_re = EXCLUDE_DIRS_GLOB_RE
+    return EXCLUDE_DIRS_LITERAL | literals, glob_re
+
+
+def _long_path(path: str) -> str:
+    """
+    Return an absolute path in Windows extended-length form.
+    
+    With the `\\\\?\\` prefix, scandir accepts paths longer than MAX_PATH
+    and skips the Win32 path normalization. Other platforms get the path
+    back unchanged.
+    """
+    if os.name != "nt" or path.startswith("\\\\?\\"):
+        return path
+    if path.startswith("\\\\"):
+        # UNC share: \\server\share -> \\?\UNC\server\share
+        return "\\\\?\\UNC\\" + path[2:]
+    return "\\\\?\\" + path
+
+
+# Stack entries: (absolute dir path, relative prefix, depth)
+_WalkItem = Tuple[str, str, int]
+
+# Longest directory name passed through sys.intern during the walk
+_INTERN_MAX_LEN = 32
+
+
+def _walk_subtree(
+    stack: Deque[_WalkItem],
+    prune_rules: Optional[_PruneRules],
+    max_depth: int,
+    callback: Optional[Callable[[str], None]],
+    session: Optional[GitCheckIgnoreSession],
+    literal_exts: FrozenSet[str],
+    descend: bool = True,
+) -> Tuple[List[str], List[str], Set[str], List[_WalkItem]]:
+    """
+    Walk the directories on `stack` with eager pruning.
+    
+    Files are streamed to `session` one directory at a time. With
+    `descend=False` only the given directories are listed and their
+    children are returned instead of being walked. `prune_rules` is None
+    in raw mode.
+    
+    Returns:
+        Tuple of (files, dirs with trailing separator, paths ignored by
+        extension, child dirs to walk)
+    """
+    files: List[str] = []
+    dirs: List[str] = []
+    ignored: Set[str] = set()
+    children: List[_WalkItem] = []
+    
+    # Bind hot-loop callables to locals once, instead of resolving
+    # globals and attributes for every entry
+    sep = os.sep
+    scandir = os.scandir
+    add_dir = dirs.append
+    push = stack.append if descend else children.append
+    prune = prune_rules is not None
+    excluded, excluded_re = prune_rules if prune else (frozenset(), None)
+    match_excluded = excluded_re.match if excluded_re is not None else None
+    intern = sys.intern
+    
+    while stack:
+        dir_path, rel_prefix, depth = stack.pop()
+        
+        # Depth limiting happens before children are queued, so
+        # directories at the limit are listed but never scanned
+        child_depth = depth + 1
+        descend_children = max_depth < 0 or child_depth < max_depth
+        
+        dir_files: List[str] = []
+        add_file = dir_files.append
+        try:
+            with scandir(dir_path) as it:
+                for entry in it:
+                    name = entry.name
+                    relpath = rel_prefix + name
+                    
+                    # Symlinked directories are listed and pruned like
+                    # directories, but never followed
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    
+                    if is_dir:
+                        # Directory names are a small, repetitive vocabulary;
+                        # interning the short ones shares one string per name
+                        # and lets set lookups hit on identity
+                        if len(name) <= _INTERN_MAX_LEN:
+                            name = intern(name)
+                        # Eager pruning (unless raw mode), inlined: a set
+                        # lookup, then at most one regex match
+                        if prune and (
+                            name in excluded
+                            or (match_excluded is not None and match_excluded(name))
+                        ):
+                            continue
+                        # Collect directories (for tree visualization); the
+                        # same string is the prefix for the children
+                        dir_prefix = relpath + sep
+                        add_dir(dir_prefix)
+                        if descend_children and not entry.is_symlink():
+                            push((entry.path, dir_prefix, child_depth))
+                    else:
+                        add_file(relpath)
+                        if callback:
+                            callback(relpath)
+        except OSError:
+            # Unreadable directory, skip it like os.walk does
+            pass
+        
+        files.extend(dir_files)
+        if session is not None:
+            # Only files (not directories) go through git check-ignore
+            if literal_exts:
+                to_check = []
+                for relpath in dir_files:
+                    # The extension of the basename: "log" alone has none
+                    name = relpath[relpath.rfind(sep) + 1:]
+                    dot = name.rfind(".")
+                    if dot >= 0 and name[dot + 1:] in literal_exts:
+                        ignored.add(relpath)
+                    else:
+                        to_check.append(relpath)
+                session.add(to_check)
+            else:
+                session.add(dir_files)
+    
+    return files, dirs, ignored, children
+
+
 def collect_files_with_pruning(
     root: str,
     raw_mode: bool = False,
@@ -171,9 +1090,19 @@ def collect_files_with_pruning(
     """
     Collect all files using the 2-phase hybrid scanning strategy.
     
-    Phase 1: Eagerly prune heavy folders during os.walk
+    Phase 1: Eagerly prune heavy folders during an os.scandir traversal
     Phase 2: Use git check-ignore for remaining files (if in a Git repo)
     
+    The traversal uses an explicit stack instead of os.walk, so the cached
+    DirEntry type information is reused and deep trees cannot hit the
+    recursion limit. Top-level subdirectories are walked in parallel
+    threads, since the work is dominated by waiting on syscalls.
+    os.fwalk is deliberately not used: it stats every entry to split
+    dirs from files and measured slower than this loop, while
+    fd-relative scandir saved only a few percent and would hold one
+    open descriptor per queued directory. Symlinked directories are
+    never followed either way.
+    
     Args:
         root: Root directory to scan
         raw_mode: If True, skip all filtering
@@ -185,60 +1114,103 @@ def collect_files_with_pruning(
         Tuple of (list of relative paths, set of ignored paths)
     """
     root = os.path.abspath(root)
-    all_relpaths: List[str] = []
-    
-    # Phase 1: Walk and collect with eager pruning
-    for dirpath, dirnames, filenames in os.walk(root):
-        # Calculate current depth
-        rel_dir = os.path.relpath(dirpath, root)
-        if rel_dir == ".":
-            current_depth = 0
-        else:
-            current_depth = rel_dir.count(os.sep) + 1
-        
-        # Depth limiting
-        if max_depth >= 0 and current_depth >= max_depth:
-            dirnames.clear()
-            continue
+    if max_depth == 0:
+        # Nothing below the root is listed, so there is nothing to check
+        return [], set()
+    
+    # Files and directories are kept apart, so neither phase has to
+    # re-split one mixed list by trailing separator
+    all_files: List[str] = []
+    all_dirs: List[str] = []
+    ignored_set: Set[str] = set()
+    
+    # Phase 2 runs alongside phase 1: files are streamed to Git per directory
+    session: Optional[GitCheckIgnoreSession] = None
+    literal_exts: FrozenSet[str] = frozenset()
+    if not raw_mode and is_git_repo(root):
+        session = GitCheckIgnoreSession(root)
+        session.start()
+        # Plain `*.ext` rules are decided here, without a Git roundtrip;
+        # a negation in any root-level rule source turns this off, as does
+        # config this can't resolve the excludes file from
+        if not _excludes_config_ambiguous(root):
+            literal_exts = gitignore_literal_extensions(
+                _root_gitignore_patterns(root)[0]
+            )
+    
+    # Exclude patterns are merged once here, not per directory entry
+    prune_rules = None if raw_mode else _compile_prune_rules(extra_excludes)
+    
+    try:
+        # Phase 1: List the root, then walk its subdirectories
+        # Relative paths are built by concatenation from "", so the
+        # prefixed root never leaks into them
+        files, dirs, ignored, subdirs = _walk_subtree(
+            deque([(_long_path(root), "", 0)]), prune_rules, max_depth,
+            callback, session, literal_exts, descend=False,
+        )
+        all_files.extend(files)
+        all_dirs.extend(dirs)
+        ignored_set |= ignored
         
-        # Eager pruning (unless raw mode)
-        if not raw_mode:
-            dirnames[:] = [
-                d for d in dirnames
-                if not should_eager_prune(d, extra_excludes)
+        if len(subdirs) > 1:
+            # Callers' progress callbacks are not expected to be thread-safe
+            if callback:
+                callback_lock = threading.Lock()
+                user_callback = callback
+                
+                def callback(relpath: str) -> None:
+                    with callback_lock:
+                        user_callback(relpath)
+            
+            workers = min(32, (os.cpu_count() or 1) * 4, len(subdirs))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(
+                        _walk_subtree, deque([item]), prune_rules, max_depth,
+                        callback, session, literal_exts,
+                    )
+                    for item in subdirs
+                ]
+                # Merge in submission order to keep output deterministic
+                results = [future.result() for future in futures]
+        else:
+            results = [
+                _walk_subtree(
+                    deque(subdirs), prune_rules, max_depth,
+                    callback, session, literal_exts,
+                )
             ]
         
-        # Collect files
-        for filename in filenames:
-            full_path = os.path.join(dirpath, filename)
-            relpath = os.path.relpath(full_path, root)
-            all_relpaths.append(relpath)
-            
-            if callback:
-                callback(relpath)
+        for files, dirs, ignored, _ in results:
+            all_files.extend(files)
+            all_dirs.extend(dirs)
+            ignored_set |= ignored
         
-        # Collect directories (for tree visualization)
-        for dirname in dirnames:
-            full_path = os.path.join(dirpath, dirname)
-            relpath = os.path.relpath(full_path, root) + os.sep
-            all_relpaths.append(relpath)
+        if ignored_set:
+            # Hand the shortcut's uncertain hits back to Git
+            unsure = _extension_hits_for_git(root, ignored_set, all_files, literal_exts)
+            if unsure:
+                ignored_set -= unsure
+                session.add(list(unsure))
+    finally:
+        if session is not None:
+            ignored_set |= session.close()
     
-    # Phase 2: Git filtering (unless raw mode)
-    ignored_set: Set[str] = set()
-    
-    if not raw_mode and is_git_repo(root):
-        # Filter only files (not directories) through git check-ignore
-        file_relpaths = [p for p in all_relpaths if not p.endswith(os.sep)]
-        ignored_set = git_check_ignore(root, file_relpaths)
-    elif not raw_mode:
+    # Phase 2 fallback (unless raw mode)
+    if session is None and not raw_mode:
         # Fallback to .gitignore parsing
         gitignore_path = os.path.join(root, ".gitignore")
         patterns = compile_gitignore_patterns(gitignore_path)
         
         if patterns:
-            for relpath in all_relpaths:
-                is_dir = relpath.endswith(os.sep)
-                if simple_gitignore_match(relpath.rstrip(os.sep), patterns, is_dir):
+            patterns = compile_gitignore_regex(patterns)
+            for relpath in all_files:
+                if simple_gitignore_match(relpath, patterns, False):
+                    ignored_set.add(relpath)
+            for relpath in all_dirs:
+                if simple_gitignore_match(relpath[:-1], patterns, True):
                     ignored_set.add(relpath)
     
-    return all_relpaths, ignored_set
+    all_files.extend(all_dirs)
+    return all_files, ignored_set
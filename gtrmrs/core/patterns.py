@@ -5,7 +5,42 @@ Default exclusion and preservation patterns.
 Combined best-of-all from rtree, locr, and gitmig.
 """
 
-from typing import List
+import fnmatch
+import re
+from typing import FrozenSet, Iterable, List, Optional, Pattern, Tuple
+
+# =============================================================================
+# Pattern Compilation Helpers
+# =============================================================================
+# Characters that turn a pattern into a glob
+GLOB_CHARS = "*?["
+
+
+def split_patterns(
+    patterns: Iterable[str],
+) -> Tuple[FrozenSet[str], Optional[Pattern[str]]]:
+    """
+    Split glob patterns into literal names and a single compiled regex.
+    
+    Literal names are matched with an O(1) set lookup, the remaining globs
+    are merged into one alternation so each name needs at most one match.
+    
+    Returns:
+        Tuple of (literal names, compiled glob regex or None)
+    """
+    literals = []
+    globs = []
+    for pattern in patterns:
+        if any(c in pattern for c in GLOB_CHARS):
+            globs.append(pattern)
+        else:
+            literals.append(pattern)
+    
+    glob_re = None
+    if globs:
+        glob_re = re.compile("|".join(fnmatch.translate(p) for p in globs))
+    return frozenset(literals), glob_re
+
 
 # =============================================================================
 # Directories to Always Exclude (Eager Pruning)
@@ -50,6 +85,9 @@ EXCLUDE_DIRS: List[str] = [
     ".turbo",
 ]
 
+# Precompiled form of EXCLUDE_DIRS for the eager pruning hot path
+EXCLUDE_DIRS_LITERAL, EXCLUDE_DIRS_GLOB_RE = split_patterns(EXCLUDE_DIRS)
+
 # =============================================================================
 # File Patterns to Exclude
 # =============================================================================
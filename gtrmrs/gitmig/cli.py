@@ -13,7 +13,7 @@ import sys
 from typing import List, Optional
 
 from gtrmrs.core.colors import Colors
-from gtrmrs.gitmig.engine import GitMigEngine
+from gtrmrs.gitmig.engine import ZIP_COMPRESSION, GitMigEngine
 
 from gtrmrs import __version__
 
@@ -46,6 +46,17 @@ def _configure_parser(parser: argparse.ArgumentParser) -> None:
         action="store_true",
         help="Compress each repo as a .zip archive.",
     )
+    parser.add_argument(
+        "--compress",
+        choices=list(ZIP_COMPRESSION),
+        default="deflate",
+        help="Compression for --zip archives ('store' is fastest). Default: deflate.",
+    )
+    parser.add_argument(
+        "--parallel-zip",
+        action="store_true",
+        help="With --zip, build the archives of several repos at once.",
+    )
     parser.add_argument(
         "--stats",
         action="store_true",
@@ -115,6 +126,11 @@ def _configure_parser(parser: argparse.ArgumentParser) -> None:
         default="",
         help="Copy only files with given extension(s) (comma-separated, e.g., 'md,py').",
     )
+    parser.add_argument(
+        "--preserve-metadata",
+        action="store_true",
+        help="Keep file timestamps and other metadata (slower).",
+    )
     parser.add_argument(
         "--git-size",
         action="store_true",
@@ -243,6 +259,9 @@ def run(args: argparse.Namespace) -> None:
         ext_filter=ext_filter,
         raw_mode=args.raw,
         check_git_size=args.git_size,
+        preserve_metadata=args.preserve_metadata,
+        compression=args.compress,
+        parallel_zip=args.parallel_zip,
     )
 
     try:
@@ -7,20 +7,53 @@ Refactored to use shared core module with .gitignore support.
 
 from __future__ import annotations
 
-import fnmatch
+import heapq
 import itertools
 import os
 import shutil
 import subprocess
 import sys
+import threading
 import time
 import zipfile
-from collections import defaultdict
-from typing import Callable, Dict, List, Optional, Set, Tuple
+from collections import Counter
+from functools import lru_cache
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
 
 from gtrmrs.core.colors import Colors
-from gtrmrs.core.patterns import EXCLUDE_DIRS, EXCLUDE_FILE_PATTERNS, PRESERVE_PATTERNS
-from gtrmrs.core.git_utils import is_git_repo, git_check_ignore
+from gtrmrs.core.patterns import (
+    EXCLUDE_DIRS,
+    EXCLUDE_FILE_PATTERNS,
+    PRESERVE_PATTERNS,
+    split_patterns,
+)
+from gtrmrs.core.git_utils import GitCheckIgnoreSession, GitignoreMatcher, is_git_repo
+
+# Linux-only, in-kernel copies (reflinks on Btrfs/XFS)
+_HAS_COPY_FILE_RANGE = hasattr(os, "copy_file_range")
+
+# Paths fed to git check-ignore per write while a repo is being walked
+CHECK_IGNORE_BATCH = 4096
+
+# --compress choices for --zip archives. store skips compression entirely,
+# which is much faster when the archive is only used for bundling.
+ZIP_COMPRESSION: Dict[str, int] = {
+    "store": zipfile.ZIP_STORED,
+    "deflate": zipfile.ZIP_DEFLATED,
+    "bzip2": zipfile.ZIP_BZIP2,
+    "lzma": zipfile.ZIP_LZMA,
+}
+
+# Files at least this large are copied in-kernel with os.copy_file_range
+COPY_RANGE_MIN = 64 * 1024
+
+# Repositories scanned ahead in worker threads while one is being copied
+SCAN_WORKERS = 8
+
+# skipped_stats value for an excluded directory whose files were not counted
+SKIPPED_UNCOUNTED = -1
 
 # Env file patterns for --env mode
 ENV_PATTERNS: List[str] = [
@@ -30,6 +63,61 @@ ENV_PATTERNS: List[str] = [
 ]
 
 
+def _is_empty_dir(path: str) -> bool:
+    """Return True if path is missing or an empty directory."""
+    try:
+        with os.scandir(path) as it:
+            return next(it, None) is None
+    except FileNotFoundError:
+        return True
+    except OSError:
+        return False
+
+
+# Basenames remembered per name matcher (they repeat heavily across repos)
+NAME_CACHE_SIZE = 4096
+
+
+def _cached_name_matcher(patterns: List[str]) -> Callable[[str], bool]:
+    """
+    Build a memoized basename predicate for a list of glob patterns.
+
+    Args:
+        patterns: fnmatch-style patterns matched against the whole name
+
+    Returns:
+        Function returning True if a filename matches any pattern
+    """
+    names, regex = split_patterns(patterns)
+
+    @lru_cache(maxsize=NAME_CACHE_SIZE)
+    def match(filename: str) -> bool:
+        if filename in names:
+            return True
+        return bool(regex and regex.match(filename))
+
+    return match
+
+
+_is_preserved = _cached_name_matcher(PRESERVE_PATTERNS)
+_is_env_file = _cached_name_matcher(ENV_PATTERNS)
+
+
+def _file_ext(filename: str) -> str:
+    """
+    Return the lowercased extension of a filename, including its dot.
+
+    Same result as ``os.path.splitext(filename)[1].lower()`` (leading dots
+    do not start an extension) using a single rfind instead.
+    """
+    dot = filename.rfind(".")
+    if dot <= 0:
+        return ""
+    if filename[0] == "." and not filename[:dot].lstrip("."):
+        return ""
+    return filename[dot:].lower()
+
+
 class GitMigEngine:
     """Copy Git repositories without dependencies."""
 
@@ -53,6 +141,9 @@ class GitMigEngine:
         ext_filter: Optional[List[str]] = None,
         raw_mode: bool = False,
         check_git_size: bool = False,
+        preserve_metadata: bool = False,
+        compression: str = "deflate",
+        parallel_zip: bool = False,
     ):
         self.source_dir = os.path.abspath(source_dir)
         self.dest_dir = os.path.abspath(dest_dir)
@@ -63,7 +154,7 @@ class GitMigEngine:
         self.verbose = verbose
         self.quiet = quiet
         self.max_size = max_size
-        self.only_repos = only_repos
+        self.only_repos = frozenset(only_repos) if only_repos else None
         self.force = force
         self.stats_all = stats_all
         self.skip_existing = skip_existing
@@ -71,6 +162,12 @@ class GitMigEngine:
         self.ext_filter = ext_filter  # List of extensions like ['md', 'py']
         self.raw_mode = raw_mode  # Include gitignored files but exclude dependencies
         self.check_git_size = check_git_size
+        self.preserve_metadata = preserve_metadata  # Timestamps etc. via copy2
+        self.compression = ZIP_COMPRESSION[compression]
+        self.parallel_zip = parallel_zip  # Build several repo zips at once
+        # Counting files in excluded dirs (node_modules...) costs a full walk
+        # of them, so only do it when the numbers are reported in detail
+        self.count_skipped = show_stats or verbose or dry_run
 
         # Merge excludes
         self.exclude_dirs = list(EXCLUDE_DIRS)
@@ -88,6 +185,13 @@ class GitMigEngine:
         if self.include_git and ".git" in self.exclude_dirs:
             self.exclude_dirs.remove(".git")
 
+        # Exact names are set lookups, globs are merged into one regex
+        self._exclude_dir_names, self._exclude_dir_re = split_patterns(self.exclude_dirs)
+        self._is_excluded_file = _cached_name_matcher(self.exclude_files)
+        self._ext_set = frozenset(ext_filter) if ext_filter else frozenset()
+        # Per-file name test for Phase 3, specialized for the selected mode
+        self._name_verdict = self._make_name_verdict()
+
         # Stats
         self.repos_found: List[str] = []
         self.total_files_copied = 0
@@ -101,10 +205,13 @@ class GitMigEngine:
         self.start_time: float = 0
         self.was_interrupted = False
 
-        # Stats per extension
-        self.extension_stats: Dict[str, Dict[str, int]] = defaultdict(
-            lambda: {"count": 0, "bytes": 0}
-        )
+        # Stats per extension: file count and total bytes
+        self._ext_count: Counter = Counter()
+        self._ext_bytes: Counter = Counter()
+
+        # Scans may run in worker threads; output goes through the main one
+        self._local = threading.local()
+        self._main_thread = threading.current_thread()
 
         # Spinner
         self.spinner = itertools.cycle(["|", "/", "-", "\\"])
@@ -113,6 +220,12 @@ class GitMigEngine:
 
     def _print(self, message: str = "", style_color: str = None) -> None:
         """Print message unless in quiet mode."""
+        log = getattr(self._local, "log", None)
+        if log is not None:
+            # Inside a detached scan: defer so output stays in repo order
+            if not self.quiet:
+                log.append(Colors.style(message, style_color) if style_color else message)
+            return
         if not self.quiet:
             if style_color:
                 print(Colors.style(message, style_color))
@@ -121,18 +234,71 @@ class GitMigEngine:
 
     def _print_error(self, message: str) -> None:
         """Always print errors, even in quiet mode."""
+        log = getattr(self._local, "log", None)
+        if log is not None:
+            log.append(Colors.style(message, Colors.RED))
+            return
         print(Colors.style(message, Colors.RED))
 
+    def _line_writer(self) -> Callable[..., None]:
+        """
+        Return a writer for the per-file lines of the copy and zip loops.
+        
+        Lines go straight to the stdout byte buffer through Colors.write
+        instead of print(). Call sys.stdout.flush() when the loop is done.
+        """
+        log = getattr(self._local, "log", None)
+        if log is not None:
+            # Inside a detached zip: defer so output stays in repo order
+            def write(text: str, color: bytes = b"", always: bool = False) -> None:
+                if always or not self.quiet:
+                    log.append(Colors.style(text, color.decode()) if color else text)
+            return write
+        
+        out = getattr(sys.stdout, "buffer", None)
+        
+        if out is None:
+            def write(text: str, color: bytes = b"", always: bool = False) -> None:
+                if always or not self.quiet:
+                    print(Colors.style(text, color.decode()) if color else text)
+            return write
+        
+        encoding = sys.stdout.encoding or "utf-8"
+        # Pending text-layer output must land before our raw bytes
+        sys.stdout.flush()
+        
+        def write(text: str, color: bytes = b"", always: bool = False) -> None:
+            if always or not self.quiet:
+                Colors.write(out, text, color, encoding=encoding)
+        return write
+
     def _update_spinner(self, msg: str = "") -> None:
-        """Update spinner if active."""
-        if not self.spinner_active:
+        """
+        Update spinner if active.
+        
+        The spinner goes to stderr so that it never forces a flush of the
+        (block-buffered) stdout lines written by the copy loops.
+        """
+        if not self.spinner_active or threading.current_thread() is not self._main_thread:
             return
         now = time.time()
         if now - self.last_spin_time > 0.1:
-            sys.stdout.write(f"\r{msg} {next(self.spinner)}")
-            sys.stdout.flush()
+            sys.stderr.write(f"\r{msg} {next(self.spinner)}")
+            sys.stderr.flush()
             self.last_spin_time = now
 
+    def _clear_spinner(self) -> None:
+        """Blank the spinner line before regular output."""
+        if self.spinner_active:
+            sys.stderr.write("\r" + " " * 50 + "\r")
+            sys.stderr.flush()
+
+    def _write_deferred(self, lines: List[str]) -> None:
+        """Print lines collected by a worker thread in a single write."""
+        if lines:
+            self._clear_spinner()
+            sys.stdout.write("\n".join(lines) + "\n")
+
     def _get_dir_size(self, path: str) -> int:
         """Calculate total size of a directory."""
         total = 0
@@ -148,6 +314,26 @@ class GitMigEngine:
             pass
         return total
 
+    def _count_files(self, path: str) -> int:
+        """Count files below `path` without statting them, as os.walk would list them."""
+        count = 0
+        stack = [path]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as it:
+                    for entry in it:
+                        try:
+                            is_dir = entry.is_dir()
+                        except OSError:
+                            is_dir = False
+                        if not is_dir:
+                            count += 1
+                        elif not entry.is_symlink():
+                            stack.append(entry.path)
+            except OSError:
+                pass
+        return count
+
     def _make_clickable(self, path: str) -> str:
         """Make a file path clickable in supported terminals using OSC 8."""
         file_url = f"file://{path.replace(os.sep, '/')}"
@@ -157,9 +343,11 @@ class GitMigEngine:
         """Check if path is a Git repository."""
         return is_git_repo(path)
 
-    def _git_check_ignore(self, repo_path: str, relpaths: List[str]) -> Set[str]:
-        """Use git check-ignore to determine ignored paths."""
-        return git_check_ignore(repo_path, relpaths)
+    def _ignore_matcher(self, repo_path: str) -> Optional[GitignoreMatcher]:
+        """Build the in-process gitignore matcher, or None if not filtering."""
+        if self.raw_mode or not self._is_git_repo(repo_path):
+            return None
+        return GitignoreMatcher(repo_path)
 
     def _find_repos(self) -> List[str]:
         """Find repos to process based on source directory."""
@@ -168,52 +356,225 @@ class GitMigEngine:
             return [os.path.basename(self.source_dir)]
 
         # Otherwise, find all repos in the directory
+        # scandir's d_type answers is_dir() without a stat (symlinked
+        # directories are still followed, as os.path.isdir did)
         repos = []
         try:
-            for entry in sorted(os.listdir(self.source_dir)):
-                full_path = os.path.join(self.source_dir, entry)
-                if os.path.isdir(full_path) and self._is_git_repo(full_path):
-                    if self.only_repos and entry not in self.only_repos:
+            with os.scandir(self.source_dir) as it:
+                for entry in it:
+                    if self.only_repos and entry.name not in self.only_repos:
                         continue
-                    repos.append(entry)
+                    if entry.is_dir() and self._is_git_repo(entry.path):
+                        repos.append(entry.name)
         except PermissionError:
             pass
+        repos.sort()
         return repos
 
     def _should_exclude_dir(self, dirname: str) -> bool:
         """Check if a directory should be excluded."""
-        for pattern in self.exclude_dirs:
-            if fnmatch.fnmatch(dirname, pattern) or dirname == pattern:
-                return True
-        return False
+        if dirname in self._exclude_dir_names:
+            return True
+        return bool(self._exclude_dir_re and self._exclude_dir_re.match(dirname))
 
     def _should_exclude_file(self, filename: str) -> bool:
         """Check if a file should be excluded."""
-        for pattern in self.exclude_files:
-            if fnmatch.fnmatch(filename, pattern):
-                return True
-        return False
+        return self._is_excluded_file(filename)
+
+    def _make_name_verdict(self) -> Callable[[str], Tuple[bool, bool]]:
+        """
+        Build the cached basename test used by Phase 3 of a scan.
+        
+        The mode is fixed for the engine's lifetime, so it is decided here
+        once instead of being branched on for every file.
+        
+        Returns:
+            Function mapping a filename to (preserve, excluded)
+        """
+        if self.env_only or self.ext_filter:
+            # The walk already selected the files; nothing is excluded
+            @lru_cache(maxsize=NAME_CACHE_SIZE)
+            def verdict(filename: str) -> Tuple[bool, bool]:
+                return _is_preserved(filename), False
+        else:
+            is_excluded_file = self._is_excluded_file
+
+            @lru_cache(maxsize=NAME_CACHE_SIZE)
+            def verdict(filename: str) -> Tuple[bool, bool]:
+                preserve = _is_preserved(filename)
+                return preserve, not preserve and is_excluded_file(filename)
+        return verdict
 
     def _should_preserve(self, filename: str) -> bool:
         """Check if a file should be preserved (override exclusion)."""
-        for pattern in PRESERVE_PATTERNS:
-            if fnmatch.fnmatch(filename, pattern):
-                return True
-        return False
+        return _is_preserved(filename)
 
     def _matches_env_pattern(self, filename: str) -> bool:
         """Check if file matches env patterns."""
-        for pattern in ENV_PATTERNS:
-            if fnmatch.fnmatch(filename, pattern):
-                return True
-        return False
+        return _is_env_file(filename)
 
-    def _matches_ext_filter(self, filename: str) -> bool:
-        """Check if file matches extension filter."""
-        if not self.ext_filter:
+    def _matches_ext_filter(self, filename: str, ext: Optional[str] = None) -> bool:
+        """Check if file matches extension filter.
+
+        Args:
+            filename: Base name of the file
+            ext: Precomputed ``_file_ext(filename)``, if the caller has it
+        """
+        if not self._ext_set:
             return True
-        ext = os.path.splitext(filename)[1].lower().lstrip(".")
-        return ext in self.ext_filter
+        if ext is None:
+            ext = _file_ext(filename)
+        return ext[1:] in self._ext_set
+
+    def _scandir_walk(
+        self,
+        repo_name: str,
+        roots: List[Tuple[str, str]],
+        skipped_stats: Dict[str, int],
+        matcher: Optional[GitignoreMatcher] = None,
+        ignored_dirs: Optional[List[Tuple[str, str]]] = None,
+        name_filter: Optional[Callable[[str], bool]] = None,
+    ) -> Iterator[Tuple[str, os.DirEntry]]:
+        """
+        Walk directories with os.scandir, yielding (rel_path, DirEntry).
+        
+        `roots` holds (absolute path, relative prefix) pairs. Only
+        non-directory entries are yielded, in the same order as os.walk.
+        The DirEntry answers the symlink and size questions later without
+        another stat by path. Excluded directories are pruned and counted
+        into `skipped_stats` (SKIPPED_UNCOUNTED unless counts are shown).
+        
+        With a `matcher`, nested .gitignore files are loaded as their
+        directories are entered, and subdirectories it ignores are not
+        entered but appended to `ignored_dirs` instead. `name_filter`
+        limits which file names are yielded.
+        """
+        stack: List[Tuple[str, str]] = list(reversed(roots))
+        sep = os.sep
+        
+        while stack:
+            if self.was_interrupted:
+                return
+            dir_path, rel_dir = stack.pop()
+            self._update_spinner(f"Scanning {repo_name}")
+            if matcher is not None:
+                matcher.load_dir(rel_dir, dir_path)
+            
+            subdirs: List[Tuple[str, str]] = []
+            try:
+                with os.scandir(dir_path) as it:
+                    for entry in it:
+                        name = entry.name
+                        rel_path = rel_dir + name
+                        
+                        try:
+                            # Follows symlinks like os.walk's dir/file split
+                            is_dir = entry.is_dir()
+                        except OSError:
+                            is_dir = False
+                        
+                        if not is_dir:
+                            if name_filter is None or name_filter(name):
+                                yield rel_path, entry
+                            continue
+                        
+                        # Eager prune excluded directories
+                        if self._should_exclude_dir(name):
+                            if self.count_skipped:
+                                count = self._count_files(entry.path)
+                                skipped_stats[name] = skipped_stats.get(name, 0) + count
+                            else:
+                                skipped_stats[name] = SKIPPED_UNCOUNTED
+                            continue
+                        
+                        # Symlinked directories are listed but never entered
+                        if entry.is_symlink():
+                            continue
+                        
+                        if matcher is not None and matcher.match(rel_path, is_dir=True):
+                            ignored_dirs.append((entry.path, rel_path + sep))
+                            continue
+                        
+                        subdirs.append((entry.path, rel_path + sep))
+            except OSError as e:
+                self._on_walk_error(e)
+                continue
+            
+            # Reversed, so the first subdirectory is walked next
+            stack.extend(reversed(subdirs))
+
+    def _collect_entries(
+        self,
+        repo_name: str,
+        repo_path: str,
+        skipped_stats: Dict[str, int],
+        matcher: Optional[GitignoreMatcher],
+        name_filter: Optional[Callable[[str], bool]] = None,
+    ) -> Tuple[List[Tuple[str, os.DirEntry]], Set[str]]:
+        """
+        Walk a repository and return (entries, paths ignored by Git).
+        
+        `name_filter`, if given, drops files by basename during the walk.
+        
+        .gitignore rules are matched in-process during the walk to prune
+        ignored directories, but every file still goes to Git, which has
+        the final say because it knows tracked files are never ignored and
+        reads config the matcher doesn't; the Git process is only spawned
+        once there is something to confirm. Ignored directories are not
+        entered: once Git confirms them only preserved files are picked up
+        from them, while those holding tracked files are walked in a next
+        round.
+        """
+        entries: List[Tuple[str, os.DirEntry]] = []
+        ignored_by_git: Set[str] = set()
+        roots = [(repo_path, "")]
+        
+        while roots:
+            session: Optional[GitCheckIgnoreSession] = None
+            ignored_dirs: List[Tuple[str, str]] = []
+            confirmed: Set[str] = set()
+            batch: List[str] = []
+            
+            def confirm(paths: List[str]) -> None:
+                nonlocal session
+                if session is None:
+                    session = GitCheckIgnoreSession(repo_path)
+                    session.start()
+                session.add(paths)
+            
+            try:
+                for item in self._scandir_walk(
+                    repo_name, roots, skipped_stats, matcher, ignored_dirs, name_filter
+                ):
+                    entries.append(item)
+                    if matcher is not None:
+                        batch.append(item[0])
+                        if len(batch) >= CHECK_IGNORE_BATCH:
+                            confirm(batch)
+                            batch = []
+                batch.extend(rel_dir for _, rel_dir in ignored_dirs)
+                if batch:
+                    confirm(batch)
+            finally:
+                if session is not None:
+                    confirmed = session.close()
+            ignored_by_git |= confirmed
+            
+            roots = []
+            for dir_path, rel_dir in ignored_dirs:
+                if rel_dir not in confirmed:
+                    # Git keeps directories holding tracked files
+                    roots.append((dir_path, rel_dir))
+                    continue
+                # Everything below is ignored, but preserved files still count
+                for item in self._scandir_walk(
+                    repo_name, [(dir_path, rel_dir)], skipped_stats,
+                    name_filter=self._should_preserve,
+                ):
+                    entries.append(item)
+                    ignored_by_git.add(item[0])
+        
+        return entries, ignored_by_git
 
     def _scan_repo(
         self, repo_name: str, repo_path: str
@@ -222,104 +583,124 @@ class GitMigEngine:
         Scan a repository and return files to copy.
         Uses .gitignore for filtering when available.
         """
+        files_to_copy, skipped_stats, stats = self._scan_repo_detached(repo_name, repo_path)
+        self._apply_scan_stats(stats)
+        return files_to_copy, skipped_stats
+
+    def _apply_scan_stats(self, stats: Dict) -> None:
+        """Merge the stats of one detached scan and print its deferred output."""
+        self.symlinks_skipped += stats["symlinks"]
+        self.large_files_skipped += stats["large"]
+        self.preserved_files.extend(stats["preserved"])
+        self._ext_count.update(stats["ext_count"])
+        self._ext_bytes.update(stats["ext_bytes"])
+        # Deferred lines were already filtered for quiet mode
+        self._write_deferred(stats["log"])
+
+    def _scan_repo_detached(
+        self, repo_name: str, repo_path: str
+    ) -> Tuple[List[Tuple[str, int]], Dict[str, int], Dict]:
+        """
+        Scan a repository without touching shared state, so it can run in
+        a worker thread. Stats and output are returned for
+        _apply_scan_stats() instead.
+        """
         files_to_copy: List[Tuple[str, int]] = []
         skipped_stats: Dict[str, int] = {}
-        all_relpaths: List[str] = []
-
-        # Phase 1: Walk and collect with eager pruning
+        symlinks = 0
+        large = 0
+        preserved: List[str] = []
+        ext_count: Counter = Counter()
+        ext_bytes: Counter = Counter()
+        log: List[str] = []
+        self._local.log = log
+
+        # Phase 1 + 2: Walk with eager pruning and .gitignore filtering.
+        # --env and --ext select files by name only, so they skip ignore
+        # rules and drop other files during the walk
+        matcher = None
+        name_filter: Optional[Callable[[str], bool]] = None
+        if self.env_only:
+            name_filter = _is_env_file
+        elif self.ext_filter:
+            ext_set = self._ext_set
+            name_filter = lambda name: _file_ext(name)[1:] in ext_set
+        else:
+            matcher = self._ignore_matcher(repo_path)
         try:
-            for dirpath, dirnames, filenames in os.walk(repo_path, topdown=True):
-                self._update_spinner(f"Scanning {repo_name}")
-
-                rel_dir = os.path.relpath(dirpath, repo_path)
-                if rel_dir == ".":
-                    rel_dir = ""
-
-                # Eager prune excluded directories
-                dirs_to_remove = []
-                for d in dirnames:
-                    if self._should_exclude_dir(d):
-                        excluded_path = os.path.join(dirpath, d)
-                        try:
-                            count = sum(
-                                len(files) for _, _, files in os.walk(excluded_path)
-                            )
-                            skipped_stats[d] = skipped_stats.get(d, 0) + count
-                        except PermissionError:
-                            skipped_stats[d] = skipped_stats.get(d, 0)
-                        dirs_to_remove.append(d)
-
-                for d in dirs_to_remove:
-                    dirnames.remove(d)
-
-                # Collect file paths
-                for f in filenames:
-                    rel_path = os.path.join(rel_dir, f) if rel_dir else f
-                    all_relpaths.append(rel_path)
-
-        except PermissionError as e:
-            self._print(f"  {Colors.style('Warning:', Colors.YELLOW)} {e}")
-            return files_to_copy, skipped_stats
+            entries, ignored_by_git = self._collect_entries(
+                repo_name, repo_path, skipped_stats, matcher, name_filter
+            )
+        finally:
+            self._local.log = None
 
-        # Phase 2: Git filtering (skip if raw_mode)
-        ignored_by_git: Set[str] = set()
-        if not self.raw_mode and self._is_git_repo(repo_path):
-            ignored_by_git = self._git_check_ignore(repo_path, all_relpaths)
+        # Phase 3: Process files with all filters. This runs once per file,
+        # so attributes and bound methods are looked up once beforehand
+        max_size = self.max_size or 0
+        verbose = self.verbose
+        name_verdict = self._name_verdict
+        file_ext = _file_ext
+        add_file = files_to_copy.append
+        preserved_prefix = repo_name + "/"
 
-        # Phase 3: Process files with all filters
-        for rel_path in all_relpaths:
-            filename = os.path.basename(rel_path)
-            full_path = os.path.join(repo_path, rel_path)
+        for rel_path, entry in entries:
+            filename = entry.name
 
             # Skip symlinks
-            if os.path.islink(full_path):
-                self.symlinks_skipped += 1
+            if entry.is_symlink():
+                symlinks += 1
                 continue
 
             try:
-                file_size = os.path.getsize(full_path)
+                file_size = entry.stat(follow_symlinks=False).st_size
             except OSError:
                 file_size = 0
 
             # Skip large files
-            if self.max_size and file_size > self.max_size:
-                self.large_files_skipped += 1
-                if self.verbose:
+            if max_size and file_size > max_size:
+                large += 1
+                if verbose:
                     size_mb = file_size / (1024 * 1024)
-                    self._print(f"      Skipping large file ({size_mb:.1f} MB): {rel_path}")
+                    log.append(f"      Skipping large file ({size_mb:.1f} MB): {rel_path}")
                 continue
 
-            # Mode-specific filtering
-            if self.env_only:
-                # --env mode: only copy .env files
-                if not self._matches_env_pattern(filename):
-                    continue
-            elif self.ext_filter:
-                # --ext mode: only copy matching extensions
-                if not self._matches_ext_filter(filename):
-                    continue
-            else:
-                # Default mode: respect .gitignore but preserve special files
-                if rel_path in ignored_by_git and not self._should_preserve(filename):
-                    continue
-                if self._should_exclude_file(filename) and not self._should_preserve(filename):
-                    continue
+            # Respect .gitignore and exclusions but preserve special files
+            # (empty checks for --env and --ext, which select in the walk)
+            preserve, excluded = name_verdict(filename)
+            if excluded or (rel_path in ignored_by_git and not preserve):
+                continue
 
             # Track preserved files
-            if self._should_preserve(filename):
-                self.preserved_files.append(f"{repo_name}/{rel_path}")
+            if preserve:
+                preserved.append(preserved_prefix + rel_path)
 
-            files_to_copy.append((rel_path, file_size))
+            add_file((rel_path, file_size))
 
             # Track extension stats
-            ext = os.path.splitext(filename)[1].lower() or "(no ext)"
-            self.extension_stats[ext]["count"] += 1
-            self.extension_stats[ext]["bytes"] += file_size
-
-        return files_to_copy, skipped_stats
+            ext = file_ext(filename) or "(no ext)"
+            ext_count[ext] += 1
+            ext_bytes[ext] += file_size
+
+        stats = {
+            "symlinks": symlinks,
+            "large": large,
+            "preserved": preserved,
+            "ext_count": ext_count,
+            "ext_bytes": ext_bytes,
+            "log": log,
+        }
+        return files_to_copy, skipped_stats, stats
+
+    def _wait_for_scan(self, future: Future, msg: str) -> Tuple:
+        """Wait for a worker-pool result, keeping the spinner going."""
+        while True:
+            try:
+                return future.result(timeout=0.1)
+            except FutureTimeoutError:
+                self._update_spinner(msg)
 
     def _on_walk_error(self, error: OSError) -> None:
-        """Handle errors during os.walk."""
+        """Handle errors while walking a repository."""
         if self.verbose:
             self._print(f"  {Colors.style('Warning:', Colors.YELLOW)} {error}")
 
@@ -327,53 +708,123 @@ class GitMigEngine:
         self, repo_name: str, repo_path: str, files_to_copy: List[Tuple[str, int]]
     ) -> int:
         """Copy files from repo to destination. Returns bytes copied."""
+        # rel_path values come from our own walk, so plain concatenation is
+        # enough and avoids os.path.join() for every file
+        src_prefix = repo_path + os.sep
         dst_repo = os.path.join(self.dest_dir, repo_name)
+        dst_prefix = dst_repo + os.sep
         bytes_copied = 0
+        write = self._line_writer()
+        # Nothing can collide in an empty destination, so skip the per-file
+        # checks; with --skip-existing an exclusive create does the check
+        check_existing = not _is_empty_dir(dst_repo)
+        exclusive = check_existing and self.skip_existing
+        # Directories already created for this repo; files arrive grouped
+        # by directory, so most makedirs() calls would be redundant
+        created_dirs: Set[str] = set()
+        skipped_label = f"      {Colors.style('Skipped (exists):', Colors.GREY)} "
+        overwrite_label = f"      {Colors.style('Overwriting:', Colors.YELLOW)} "
 
         for rel_path, file_size in files_to_copy:
             if self.was_interrupted:
                 break
 
-            src_file = os.path.join(repo_path, rel_path)
-            dst_file = os.path.join(dst_repo, rel_path)
+            src_file = src_prefix + rel_path
+            dst_file = dst_prefix + rel_path
 
             try:
-                dst_dir = os.path.dirname(dst_file)
-                os.makedirs(dst_dir, exist_ok=True)
-
-                if os.path.exists(dst_file):
-                    if self.skip_existing:
-                        self.files_skipped_existing += 1
-                        if self.verbose:
-                            self._print(
-                                f"      {Colors.style('Skipped (exists):', Colors.GREY)} {rel_path}"
-                            )
-                        continue
-                    self.files_overwritten += 1
-                    if not self.force and not self.quiet:
-                        self._print(
-                            f"      {Colors.style('Overwriting:', Colors.YELLOW)} {rel_path}"
-                        )
+                dst_dir = dst_file.rpartition(os.sep)[0]
+                if dst_dir not in created_dirs:
+                    os.makedirs(dst_dir, exist_ok=True)
+                    created_dirs.add(dst_dir)
 
-                shutil.copy2(src_file, dst_file)
+                if check_existing and not exclusive and os.path.exists(dst_file):
+                    self.files_overwritten += 1
+                    if not self.force:
+                        write(overwrite_label + rel_path)
+
+                try:
+                    self._copy_file(src_file, dst_file, file_size, exclusive)
+                except FileExistsError:
+                    if not exclusive:
+                        raise
+                    self.files_skipped_existing += 1
+                    if self.verbose:
+                        write(skipped_label + rel_path)
+                    continue
                 bytes_copied += file_size
 
                 if self.verbose:
-                    self._print(f"      {rel_path}")
+                    write("      " + rel_path)
 
             except (PermissionError, OSError) as e:
-                self._print_error(f"  Warning: Could not copy {rel_path}: {e}")
+                write(f"  Warning: Could not copy {rel_path}: {e}", Colors.RED_B, always=True)
 
+        sys.stdout.flush()
         return bytes_copied
 
+    def _copy_file(self, src: str, dst: str, size: int, exclusive: bool = False) -> None:
+        """
+        Copy one file's contents and permission bits, like `cp`.
+        
+        Timestamps and other metadata are only kept with --preserve-metadata
+        (shutil.copy2). On Linux the destination is created with the source
+        mode directly and large files are copied in-kernel, which lets
+        Btrfs/XFS reflink them.
+
+        Args:
+            src: Source file path
+            dst: Destination file path
+            size: Source size from the scan
+            exclusive: Raise FileExistsError instead of overwriting dst
+        """
+        if self.preserve_metadata or not _HAS_COPY_FILE_RANGE:
+            if not exclusive:
+                (shutil.copy2 if self.preserve_metadata else shutil.copy)(src, dst)
+                return
+            with open(src, "rb") as fsrc, open(dst, "xb") as fdst:
+                shutil.copyfileobj(fsrc, fdst)
+            (shutil.copystat if self.preserve_metadata else shutil.copymode)(src, dst)
+            return
+        
+        flags = os.O_WRONLY | os.O_CREAT | (os.O_EXCL if exclusive else os.O_TRUNC)
+        with open(src, "rb") as fsrc:
+            in_fd = fsrc.fileno()
+            mode = os.fstat(in_fd).st_mode & 0o777
+            out_fd = os.open(dst, flags, mode)
+            with open(out_fd, "wb") as fdst:
+                # The open mode is masked by the umask and ignored for an
+                # existing dst, so set it explicitly like shutil.copymode
+                os.fchmod(out_fd, mode)
+                if size >= COPY_RANGE_MIN:
+                    copied = 0
+                    try:
+                        while True:
+                            sent = os.copy_file_range(in_fd, out_fd, 1 << 30)
+                            if not sent:
+                                break
+                            copied += sent
+                    except OSError:
+                        # e.g. EXDEV across filesystems on older kernels
+                        if copied:
+                            raise
+                    else:
+                        # Some filesystems (e.g. procfs) report nothing to copy
+                        if copied:
+                            return
+                shutil.copyfileobj(fsrc, fdst)
+
     def _zip_repo(
         self, repo_name: str, repo_path: str, files_to_copy: List[Tuple[str, int]]
     ) -> int:
         """Create a zip archive of the repo. Returns bytes of archive."""
         zip_path = os.path.join(self.dest_dir, f"{repo_name}.zip")
+        write = self._line_writer()
+        src_prefix = repo_path + os.sep
+        arc_prefix = repo_name + os.sep
 
         try:
-            with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+            with zipfile.ZipFile(zip_path, "w", self.compression) as zf:
                 for rel_path, file_size in files_to_copy:
                     if self.was_interrupted:
                         break
@@ -384,20 +835,52 @@ class GitMigEngine:
                         or os.path.isabs(normalized)
                         or normalized.startswith(os.sep)
                     ):
-                        self._print_error(f"  Skipping unsafe path: {rel_path}")
+                        write(f"  Skipping unsafe path: {rel_path}", Colors.RED_B, always=True)
                         continue
 
-                    src_file = os.path.join(repo_path, rel_path)
-                    arc_name = os.path.join(repo_name, rel_path).replace("\\", "/")
+                    src_file = src_prefix + rel_path
+                    arc_name = (arc_prefix + rel_path).replace("\\", "/")
                     zf.write(src_file, arc_name)
 
                     if self.verbose:
-                        self._print(f"      {rel_path}")
+                        write("      " + rel_path)
 
             return os.path.getsize(zip_path)
-        except (OSError, zipfile.BadZipFile, zipfile.LargeZipFile) as e:
+        except (OSError, RuntimeError, zipfile.BadZipFile, zipfile.LargeZipFile) as e:
+            # RuntimeError: the bz2/lzma module is missing from this Python
             self._print_error(f"  Warning: Could not create zip for {repo_name}: {e}")
             return 0
+        finally:
+            sys.stdout.flush()
+
+    def _zip_repo_detached(
+        self, repo_name: str, repo_path: str, files_to_copy: List[Tuple[str, int]]
+    ) -> Tuple[int, List[str]]:
+        """
+        Run _zip_repo() in a worker thread for --parallel-zip.
+
+        zlib and crc32 release the GIL while they work, so archives for
+        different repos compress on separate cores. Output is returned
+        instead of printed.
+        """
+        log: List[str] = []
+        self._local.log = log
+        try:
+            return self._zip_repo(repo_name, repo_path, files_to_copy), log
+        finally:
+            self._local.log = None
+
+    def _finish_zips(self, zip_jobs: List[Tuple[str, Future]]) -> None:
+        """Wait for --parallel-zip archives in repo order and print their output."""
+        for repo_name, future in zip_jobs:
+            if self.was_interrupted:
+                break
+            bytes_out, log = self._wait_for_scan(future, f"Zipping {repo_name}")
+            self._clear_spinner()
+            if log:
+                self._print(Colors.style(f"{repo_name}.zip", Colors.BLUE))
+                self._write_deferred(log)
+            self.total_bytes_copied += bytes_out
 
     def run(self) -> None:
         """Execute the migration."""
@@ -534,9 +1017,42 @@ class GitMigEngine:
         self._print()
 
         # Setup spinner
-        self.spinner_active = not self.quiet and sys.stdout.isatty()
+        self.spinner_active = not self.quiet and sys.stderr.isatty()
         if self.spinner_active:
-            sys.stdout.write(Colors.HIDE_CURSOR)
+            sys.stderr.write(Colors.HIDE_CURSOR)
+
+        # Get repo paths (different for single vs multi repo mode)
+        if is_single_repo:
+            repo_paths = [self.source_dir]
+        else:
+            repo_paths = [os.path.join(self.source_dir, name) for name in self.repos_found]
+
+        # With several repos, upcoming ones are scanned in worker threads
+        # while the main thread copies the current one. Copying and all
+        # output stay on the main thread, in repo order.
+        executor: Optional[ThreadPoolExecutor] = None
+        pending: Dict[int, Future] = {}
+        workers = min(SCAN_WORKERS, (os.cpu_count() or 1) * 2, len(self.repos_found))
+        if workers > 1:
+            executor = ThreadPoolExecutor(max_workers=workers)
+
+        def prefetch(index: int) -> None:
+            if executor is not None and index < len(self.repos_found):
+                pending[index] = executor.submit(
+                    self._scan_repo_detached, self.repos_found[index], repo_paths[index]
+                )
+
+        for index in range(workers):
+            prefetch(index)
+
+        # --parallel-zip hands each archive to its own thread; the main
+        # thread moves on to the next repo and collects them at the end
+        zip_executor: Optional[ThreadPoolExecutor] = None
+        zip_jobs: List[Tuple[str, Future]] = []
+        if self.use_zip and self.parallel_zip and not self.dry_run and len(self.repos_found) > 1:
+            zip_executor = ThreadPoolExecutor(
+                max_workers=min(os.cpu_count() or 1, len(self.repos_found))
+            )
 
         try:
             for idx, repo_name in enumerate(self.repos_found, 1):
@@ -547,19 +1063,20 @@ class GitMigEngine:
                     f"[{idx}/{len(self.repos_found)}] {Colors.style(repo_name + '/', Colors.BLUE)}"
                 )
 
-                # Get repo path (different for single vs multi repo mode)
-                if is_single_repo:
-                    repo_path = self.source_dir
+                repo_path = repo_paths[idx - 1]
+                if executor is not None:
+                    future = pending.pop(idx - 1)
+                    prefetch(idx - 1 + workers)
+                    files_to_copy, skipped_stats, stats = self._wait_for_scan(
+                        future, f"Scanning {repo_name}"
+                    )
+                    self._apply_scan_stats(stats)
                 else:
-                    repo_path = os.path.join(self.source_dir, repo_name)
-
-                files_to_copy, skipped_stats = self._scan_repo(repo_name, repo_path)
+                    files_to_copy, skipped_stats = self._scan_repo(repo_name, repo_path)
 
-                # Clear spinner line
-                if self.spinner_active:
-                    sys.stdout.write("\r" + " " * 50 + "\r")
+                self._clear_spinner()
 
-                total_skipped = sum(skipped_stats.values())
+                total_skipped = sum(v for v in skipped_stats.values() if v > 0)
                 total_bytes = sum(size for _, size in files_to_copy)
 
                 mode_label = "Zipping" if self.use_zip else "Copying"
@@ -569,15 +1086,20 @@ class GitMigEngine:
 
                 if skipped_stats and not self.env_only and not self.ext_filter:
                     skip_parts = [
-                        f"{k}/ ({v:,})"
-                        for k, v in sorted(skipped_stats.items(), key=lambda x: -x[1])[:5]
+                        f"{k}/ ({v:,})" if v != SKIPPED_UNCOUNTED else f"{k}/"
+                        for k, v in heapq.nlargest(5, skipped_stats.items(), key=lambda x: x[1])
                     ]
                     self._print(
                         f"      → Skipping: {Colors.style(', '.join(skip_parts), Colors.GREY)}"
                     )
 
                 if not self.dry_run:
-                    if self.use_zip:
+                    if zip_executor is not None:
+                        zip_jobs.append((repo_name, zip_executor.submit(
+                            self._zip_repo_detached, repo_name, repo_path, files_to_copy
+                        )))
+                        bytes_out = 0
+                    elif self.use_zip:
                         bytes_out = self._zip_repo(repo_name, repo_path, files_to_copy)
                     else:
                         bytes_out = self._copy_repo(repo_name, repo_path, files_to_copy)
@@ -589,14 +1111,30 @@ class GitMigEngine:
                 self.total_files_skipped += total_skipped
                 self._print()
 
+            self._finish_zips(zip_jobs)
+
         except KeyboardInterrupt:
             self.was_interrupted = True
             self._print()
             self._print(Colors.style("⚠ Migration interrupted.", Colors.YELLOW))
 
         finally:
+            if executor is not None:
+                if pending:
+                    # Interrupted or failed: drop queued scans and stop
+                    # running ones at the flag
+                    self.was_interrupted = True
+                for future in pending.values():
+                    future.cancel()
+                executor.shutdown(wait=True)
+            if zip_executor is not None:
+                if any(not future.done() for _, future in zip_jobs):
+                    self.was_interrupted = True
+                for _, future in zip_jobs:
+                    future.cancel()
+                zip_executor.shutdown(wait=True)
             if self.spinner_active:
-                sys.stdout.write(Colors.SHOW_CURSOR)
+                sys.stderr.write(Colors.SHOW_CURSOR)
 
         self._print_summary()
 
@@ -659,7 +1197,7 @@ class GitMigEngine:
 
         self._print(f"\nCompleted in {Colors.style(f'{elapsed:.2f}s', Colors.CYAN)}")
 
-        if self.show_stats and self.extension_stats:
+        if self.show_stats and self._ext_count:
             self._print_stats()
 
         self._print()
@@ -671,20 +1209,21 @@ class GitMigEngine:
         self._print(Colors.style("FILE TYPE BREAKDOWN", Colors.CYAN))
         self._print(Colors.style("─" * 50, Colors.WHITE))
 
-        sorted_stats = sorted(
-            self.extension_stats.items(), key=lambda x: x[1]["count"], reverse=True
-        )
-
-        if not self.stats_all:
-            sorted_stats = sorted_stats[:15]
+        ext_bytes = self._ext_bytes
+        if self.stats_all:
+            sorted_stats = sorted(
+                self._ext_count.items(), key=lambda x: x[1], reverse=True
+            )
+        else:
+            sorted_stats = self._ext_count.most_common(15)
 
         self._print(f"{'Extension':<15} {'Files':>10} {'Size':>12}")
         self._print("-" * 40)
 
-        for ext, stats in sorted_stats:
-            size_kb = stats["bytes"] / 1024
+        for ext, count in sorted_stats:
+            size_kb = ext_bytes[ext] / 1024
             if size_kb > 1024:
                 size_str = f"{size_kb / 1024:.1f} MB"
             else:
                 size_str = f"{size_kb:.1f} KB"
-            self._print(f"{ext:<15} {stats['count']:>10,} {size_str:>12}")
+            self._print(f"{ext:<15} {count:>10,} {size_str:>12}")
@@ -8,7 +8,6 @@ Lines of code counter with language-specific breakdown.
 from __future__ import annotations
 
 import argparse
-import itertools
 import json
 import os
 import shutil
@@ -28,6 +27,8 @@ WIDTH_STATS = 78
 WIDTH_SIMPLE = 72
 FMT_STATS = "{:<20} {:>12} {:>14} {:>14} {:>14}"
 FMT_SIMPLE = "{:<22} {:>10} {:>12} {:>12} {:>12}"
+SPINNER_FRAMES = ("|", "/", "-", "\\")
+SPINNER_INTERVAL_NS = 100_000_000
 
 
 def generate_report(
@@ -81,23 +82,30 @@ def generate_report(
         )
         lines.append(Colors.style(thin_sep, Colors.WHITE, use_color))
 
+        style = Colors.style
+        fmt = row_fmt.format
+        append = lines.append
         for lang, s in sorted_stats:
-            l_lines = s["blank"] + s["comment"] + s["code"]
+            files = s["files"]
+            blank = s["blank"]
+            comment = s["comment"]
+            code = s["code"]
+            l_lines = blank + comment + code
             safe_lines = l_lines if l_lines > 0 else 1
 
-            f_pct = (s["files"] / safe_total_files) * 100
-            b_pct = (s["blank"] / safe_lines) * 100
-            c_pct = (s["comment"] / safe_lines) * 100
-            k_pct = (s["code"] / safe_lines) * 100
+            f_pct = (files / safe_total_files) * 100
+            b_pct = (blank / safe_lines) * 100
+            c_pct = (comment / safe_lines) * 100
+            k_pct = (code / safe_lines) * 100
 
-            lines.append(
-                Colors.style(
-                    row_fmt.format(
+            append(
+                style(
+                    fmt(
                         lang,
-                        f"{s['files']} ({f_pct:.0f}%)",
-                        f"{s['blank']} ({b_pct:.0f}%)",
-                        f"{s['comment']} ({c_pct:.0f}%)",
-                        f"{s['code']} ({k_pct:.0f}%)",
+                        f"{files} ({f_pct:.0f}%)",
+                        f"{blank} ({b_pct:.0f}%)",
+                        f"{comment} ({c_pct:.0f}%)",
+                        f"{code} ({k_pct:.0f}%)",
                     ),
                     s["color"],
                     use_color,
@@ -135,12 +143,13 @@ def generate_report(
         )
         lines.append(Colors.style(thin_sep, Colors.WHITE, use_color))
 
+        style = Colors.style
+        fmt = row_fmt.format
+        append = lines.append
         for lang, s in sorted_stats:
-            lines.append(
-                Colors.style(
-                    header_fmt.format(
-                        lang, s["files"], s["blank"], s["comment"], s["code"]
-                    ),
+            append(
+                style(
+                    fmt(lang, s["files"], s["blank"], s["comment"], s["code"]),
                     s["color"],
                     use_color,
                 )
@@ -199,7 +208,8 @@ def generate_json_report(
             "code": s["code"],
         }
 
-    return json.dumps(output, indent=2)
+    # Plain dicts of numbers and strings: skip the reference-cycle check
+    return json.dumps(output, indent=2, check_circular=False)
 
 
 def auto_out_name(target_path: str, is_json: bool = False) -> str:
@@ -283,19 +293,19 @@ def run(args: argparse.Namespace) -> None:
         sys.stdout.write(Colors.style(msg, Colors.CYAN, use_color))
         sys.stdout.flush()
 
-    spinner = itertools.cycle(["|", "/", "-", "\\"])
+    # Called once per directory and per file: keep it cheap
     last_spin = 0
+    frame = 0
 
     def update_spinner(*args):
-        nonlocal last_spin
-        if not spinner_active:
-            return
-        now = time.time()
-        if now - last_spin > 0.1:
+        nonlocal last_spin, frame
+        now = time.monotonic_ns()
+        if now - last_spin > SPINNER_INTERVAL_NS:
             sys.stdout.write(
-                Colors.style(f"\r{msg} {next(spinner)}", Colors.CYAN, use_color)
+                Colors.style(f"\r{msg} {SPINNER_FRAMES[frame]}", Colors.CYAN, use_color)
             )
             sys.stdout.flush()
+            frame = (frame + 1) % len(SPINNER_FRAMES)
             last_spin = now
 
     start_time = time.time()
@@ -305,7 +315,7 @@ def run(args: argparse.Namespace) -> None:
 
     try:
         engine = LocrEngine(target_path, raw_mode=args.raw)
-        results = engine.scan(callback=update_spinner)
+        results = engine.scan(callback=update_spinner if spinner_active else None)
 
         if spinner_active:
             w = shutil.get_terminal_size().columns
@@ -325,6 +335,7 @@ def run(args: argparse.Namespace) -> None:
 
     end_time = time.time()
 
+    # The report is built once (use_color is already off for files)
     report_lines = []
     if not args.json:
         report_lines = generate_report(
@@ -342,22 +353,15 @@ def run(args: argparse.Namespace) -> None:
             else args.out
         )
         try:
-            if args.json:
-                content = generate_json_report(
-                    results, end_time - start_time, engine.was_interrupted
-                )
-            else:
-                clean_lines = generate_report(
-                    results,
-                    end_time - start_time,
-                    False,
-                    engine.was_interrupted,
-                    show_stats=args.stats,
-                )
-                content = "\n".join(clean_lines) + "\n"
-
             with open(filename, "w", encoding="utf-8") as f:
-                f.write(content)
+                if args.json:
+                    f.write(
+                        generate_json_report(
+                            results, end_time - start_time, engine.was_interrupted
+                        )
+                    )
+                else:
+                    f.writelines(line + "\n" for line in report_lines)
             print(f"Output written to: {filename}")
         except OSError as e:
             print(f"Error writing to file: {e}")
@@ -369,7 +373,7 @@ def run(args: argparse.Namespace) -> None:
                 )
             )
         else:
-            print("\n".join(report_lines))
+            sys.stdout.writelines(line + "\n" for line in report_lines)
 
 
 def main() -> None:
@@ -7,21 +7,45 @@ Refactored to use shared core module.
 
 from __future__ import annotations
 
-import fnmatch
+import io
 import os
 import subprocess
-from collections import defaultdict
-from typing import Callable, Dict, List, Optional, Set, Tuple
-
-from gtrmrs.core.colors import Colors
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 from gtrmrs.core.patterns import EXCLUDE_DIRS
 from gtrmrs.core.git_utils import (
+    CompiledGitignore,
+    GitCheckIgnoreSession,
+    GitignoreMatcher,
+    compile_gitignore_regex,
     is_git_repo,
     git_check_ignore,
+    git_tracked_ignored,
     simple_gitignore_match,
 )
-from gtrmrs.locr.languages import LANGUAGES
+from gtrmrs.locr.languages import LANGUAGES, LANGUAGES_FAST
+
+# Paths sent to `git check-ignore` per batch while walking
+CHECK_IGNORE_BATCH = 4096
+
+# Scans with at least this many files are analyzed in worker processes
+PARALLEL_MIN_FILES = 2000
+
+# Files handed to a worker process at a time
+PARALLEL_CHUNK = 64
+
+# Scans with at least this many files read ahead on a thread pool when
+# they stay in one process; reads release the GIL while classifying runs
+READ_AHEAD_MIN_FILES = 64
+
+# Files read ahead of the one being classified, and threads reading them
+READ_AHEAD = 16
+READ_AHEAD_THREADS = 4
+
+# Line breaks for str.splitlines() that text-mode file iteration ignores
+_EXTRA_LINE_BREAKS = ("\x0b", "\x0c", "\x1c", "\x1d", "\x1e", "\x85", "\u2028", "\u2029")
 
 
 class LocrEngine:
@@ -32,42 +56,23 @@ class LocrEngine:
         self.raw_mode = raw_mode
         self.was_interrupted = False
 
-        # Load patterns for eager pruning
-        self.simple_patterns: List[Tuple[str, bool, bool]] = []
+        # Rules for eager pruning
+        self.simple_patterns: Optional[CompiledGitignore] = None
         if not self.raw_mode:
             self.simple_patterns = self._load_default_patterns()
 
-    def _load_default_patterns(self) -> List[Tuple[str, bool, bool]]:
-        """Load default patterns plus .gitignore for fast pruning."""
-        patterns = list(EXCLUDE_DIRS)
-        gitignore_path = os.path.join(self.repo_path, ".gitignore")
+    def _load_default_patterns(self) -> CompiledGitignore:
+        """
+        Compile the default directory excludes for fast pruning.
         
-        if os.path.exists(gitignore_path):
-            try:
-                with open(gitignore_path, "r", encoding="utf-8", errors="ignore") as f:
-                    for line in f:
-                        line = line.strip()
-                        if line and not line.startswith("#"):
-                            patterns.append(line)
-            except PermissionError:
-                pass
-
-        # Compile for fnmatch
-        compiled = []
-        for raw in patterns:
-            p = raw.strip()
-            is_dir = p.endswith("/")
-            if is_dir:
-                p = p[:-1]
-            anchored = p.startswith("/")
-            if anchored:
-                p = p[1:]
-            p = p.replace("\\", "/")
-            compiled.append((p, is_dir, anchored))
-        return compiled
+        They are merged into one regex union, so each directory is checked
+        with a single match instead of one fnmatch call per pattern.
+        .gitignore rules are matched separately by a GitignoreMatcher.
+        """
+        return compile_gitignore_regex([(name, False, True) for name in EXCLUDE_DIRS])
 
     def _simple_gitignore_match(
-        self, relpath: str, patterns: List[Tuple[str, bool, bool]]
+        self, relpath: str, patterns: CompiledGitignore
     ) -> bool:
         """Simple pattern matching for eager pruning."""
         is_dir = relpath.endswith("/")
@@ -78,156 +83,463 @@ class LocrEngine:
         """Check if this is a Git repository."""
         return is_git_repo(self.repo_path)
 
+    def _ignore_matcher(self, git_excludes: bool) -> Optional[GitignoreMatcher]:
+        """
+        Build the in-process gitignore matcher, or None in raw mode.
+        
+        In a Git repository it also loads the global excludes file and
+        `.git/info/exclude`, so it sees every rule `git check-ignore` would.
+        """
+        if self.raw_mode:
+            return None
+        return GitignoreMatcher(self.repo_path, git_excludes=git_excludes)
+
     def _git_check_ignore(self, relpaths: List[str]) -> Set[str]:
         """Use git check-ignore for accurate filtering."""
         return git_check_ignore(self.repo_path, relpaths)
 
+    def _iter_files(
+        self,
+        callback: Optional[Callable[[], None]] = None,
+        matcher: Optional[GitignoreMatcher] = None,
+        keep_inexact: bool = False,
+    ) -> Iterator[Tuple[str, str, str]]:
+        """
+        Walk the repository with os.scandir, pruning as we go.
+        
+        Visits directories in os.walk's top-down order, but takes names,
+        types and full paths from the DirEntry objects instead of
+        re-joining and re-stat'ing them. Like os.walk, symlinked
+        directories are not entered. With a `matcher` (never in raw
+        mode), every .gitignore along the way is loaded as its directory
+        is entered, and the paths its rules ignore are pruned. With
+        `keep_inexact`, nothing is pruned by those rules once the matcher
+        is no longer exact, so Git can decide instead.
+        
+        Yields:
+            (relative path with "/" separators, full path, LANGUAGES key)
+            of each file with a known extension
+        """
+        languages = LANGUAGES
+        prune = not self.raw_mode
+        patterns = self.simple_patterns
+        if prune and matcher is None:
+            matcher = self._ignore_matcher(git_excludes=False)
+        # Relative dirs come in two spellings: with "/" for Git, and with
+        # os.sep for the matcher. On POSIX both are the same string
+        posix = os.sep == "/"
+        stack = [(self.repo_path, "", "")]
+
+        while stack:
+            dir_path, rel_dir, native_dir = stack.pop()
+            if callback:
+                callback()
+            if matcher is not None:
+                matcher.load_dir(native_dir, dir_path)
+            try:
+                with os.scandir(dir_path) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+
+            subdirs = []
+            for entry in entries:
+                name = entry.name
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+
+                if is_dir:
+                    if prune:
+                        if name == ".git":
+                            continue
+                        # Default excludes are bare names: the name alone decides
+                        if simple_gitignore_match(name, patterns, True):
+                            continue
+                        if (not keep_inexact or matcher.exact) and matcher.match(
+                            native_dir + name, is_dir=True
+                        ):
+                            continue
+                    if not entry.is_symlink():
+                        rel_sub = rel_dir + name + "/"
+                        native_sub = rel_sub if posix else native_dir + name + os.sep
+                        subdirs.append((entry.path, rel_sub, native_sub))
+                    continue
+
+                # Only track files with known extensions (splitext rules:
+                # leading dots, as in ".py", do not start an extension)
+                dot = name.rfind(".")
+                if dot <= 0:
+                    continue
+                ext = name[dot:].lower()
+                if ext not in languages:
+                    continue
+                if name[0] == "." and not name[:dot].lstrip("."):
+                    continue
+                rel_path = rel_dir + name
+                if (
+                    prune
+                    and (not keep_inexact or matcher.exact)
+                    and matcher.match(rel_path if posix else native_dir + name)
+                ):
+                    continue
+                yield rel_path, entry.path, ext
+
+            # Depth-first, in listing order
+            stack.extend(reversed(subdirs))
+
     def _collect_and_filter_files(
         self, callback: Optional[Callable[[], None]] = None
-    ) -> List[str]:
+    ) -> List[Tuple[str, str, str]]:
         """
         Collect files using 2-phase hybrid scanning:
         Phase 1: Walk & prune heavy folders
         Phase 2: Use Git for precision filtering
+        
+        Returns:
+            (relative path, full path, LANGUAGES key) for each file
         """
-        all_rel_paths = []
-
-        # Phase 1: Walk & Prune
+        # Phase 1: Walk & Prune. The walk applies every ignore rule Git
+        # would, so while the matcher stays exact `git check-ignore` is not
+        # needed; once some rule turns out to need it, paths are streamed
+        # to it while the walk is still running
+        check_git = not self.raw_mode and self._is_git_repo()
+        matcher = self._ignore_matcher(check_git)
+        session: Optional[GitCheckIgnoreSession] = None
+        all_files: List[Tuple[str, str, str]] = []
+        fed = 0
         try:
-            for dirpath, dirnames, filenames in os.walk(self.repo_path, topdown=True):
-                if callback:
-                    callback()
-
-                rel_dir = os.path.relpath(dirpath, self.repo_path)
-                if rel_dir == ".":
-                    rel_dir = ""
-                else:
-                    rel_dir = rel_dir.replace(os.sep, "/")
-
-                if not self.raw_mode:
-                    # Eager pruning
-                    active_dirs = []
-                    for d in dirnames:
-                        if d == ".git":
-                            continue
-                        path_to_check = (rel_dir + "/" + d) if rel_dir else d
-                        if not self._simple_gitignore_match(
-                            path_to_check, self.simple_patterns
-                        ):
-                            active_dirs.append(d)
-                    dirnames[:] = active_dirs
-
-                for f in filenames:
-                    # Only track files with known extensions
-                    ext = os.path.splitext(f)[1].lower()
-                    if ext not in LANGUAGES:
-                        continue
-
-                    rel_path = (rel_dir + "/" + f if rel_dir else f).replace(
-                        os.sep, "/"
-                    )
-
-                    if not self.raw_mode and self._simple_gitignore_match(
-                        rel_path, self.simple_patterns
-                    ):
-                        continue
-
-                    all_rel_paths.append(rel_path)
-
+            for item in self._iter_files(callback, matcher, keep_inexact=check_git):
+                all_files.append(item)
+                if not check_git or matcher.exact:
+                    continue
+                if len(all_files) - fed >= CHECK_IGNORE_BATCH:
+                    if session is None:
+                        session = GitCheckIgnoreSession(self.repo_path)
+                        session.start()
+                    session.add([rel_path for rel_path, _, _ in all_files[fed:]])
+                    fed = len(all_files)
         except KeyboardInterrupt:
             self.was_interrupted = True
+            if session is not None:
+                session.close()
             return []
 
-        if self.raw_mode or not all_rel_paths:
-            return all_rel_paths
+        if not check_git:
+            return all_files
 
-        # Phase 2: Git Accuracy
-        final_list = []
-        ignored_by_git = set()
-
-        if self._is_git_repo():
-            ignored_by_git = self._git_check_ignore(all_rel_paths)
+        # Tracked files are never ignored, but the walk pruned any that
+        # match a rule; Git lists those, usually none, in one call
+        tracked = self._tracked_ignored_files(all_files)
 
-        for p in all_rel_paths:
-            if p not in ignored_by_git:
-                final_list.append(p)
+        if matcher.exact or not all_files:
+            return all_files + tracked
 
-        return final_list
+        # Phase 2: Git Accuracy
+        rest = [rel_path for rel_path, _, _ in all_files[fed:]]
+        if session is None:
+            ignored_by_git = self._git_check_ignore(rest)
+        else:
+            session.add(rest)
+            ignored_by_git = session.close()
+        return [item for item in all_files if item[0] not in ignored_by_git] + tracked
+
+    def _tracked_ignored_files(
+        self, walked: List[Tuple[str, str, str]]
+    ) -> List[Tuple[str, str, str]]:
+        """
+        Return the tracked files matching an ignore rule that the walk missed.
+        
+        They pass the walk's own tests: nothing below `.git` or a default
+        exclude, a known extension, and present on disk.
+        """
+        tracked = git_tracked_ignored(self.repo_path)
+        if not tracked:
+            return []
+        seen = {rel_path for rel_path, _, _ in walked}
+        patterns = self.simple_patterns
+        extra = []
+        for rel_path in sorted(tracked - seen):
+            *dirs, name = rel_path.split("/")
+            if any(
+                d == ".git" or simple_gitignore_match(d, patterns, True) for d in dirs
+            ):
+                continue
+            ext = _language_ext(name)
+            if ext is None:
+                continue
+            full_path = os.path.join(self.repo_path, *rel_path.split("/"))
+            if os.path.isfile(full_path):
+                extra.append((rel_path, full_path, ext))
+        return extra
 
     def scan(self, callback: Optional[Callable[[], None]] = None) -> Dict:
         """Scan repository and count lines of code."""
-        results = defaultdict(
-            lambda: {
-                "files": 0,
-                "blank": 0,
-                "comment": 0,
-                "code": 0,
-                "color": Colors.WHITE,
-            }
-        )
+        # One preallocated entry per language, shared by all its extensions.
+        # Entries join `results` the first time a file counts towards them,
+        # so the report keeps first-seen order and skips empty languages
+        entries: Dict[str, dict] = {}
+        by_ext: Dict[str, Tuple[str, dict]] = {}
+        for lang_ext, (name, color, _, _, _) in LANGUAGES_FAST.items():
+            if name not in entries:
+                entries[name] = {
+                    "files": 0,
+                    "blank": 0,
+                    "comment": 0,
+                    "code": 0,
+                    "color": color,
+                }
+            by_ext[lang_ext] = (name, entries[name])
+        results: Dict[str, dict] = {}
         self.was_interrupted = False
 
         try:
             valid_files = self._collect_and_filter_files(callback)
 
-            for rel_path in valid_files:
+            jobs = [(full_path, ext) for _, full_path, ext in valid_files]
+
+            # Large scans are spread over worker processes; below the
+            # threshold their startup costs more than it saves
+            if len(jobs) >= PARALLEL_MIN_FILES and (os.cpu_count() or 1) > 1:
+                counts = self._analyze_parallel(jobs)
+            elif len(jobs) >= READ_AHEAD_MIN_FILES:
+                counts = self._analyze_read_ahead(jobs)
+            else:
+                counts = map(_analyze_worker, jobs)
+
+            for ext, b, c, k in counts:
                 if self.was_interrupted:
                     break
                 if callback:
                     callback()
 
-                full_path = os.path.join(self.repo_path, rel_path)
-                ext = os.path.splitext(rel_path)[1].lower()
-
-                if ext in LANGUAGES:
-                    lang_def = LANGUAGES[ext]
-                    b, c, k = self._analyze_file(full_path, lang_def)
-
-                    name = lang_def["name"]
-                    results[name]["files"] += 1
-                    results[name]["blank"] += b
-                    results[name]["comment"] += c
-                    results[name]["code"] += k
-                    results[name]["color"] = lang_def.get("color", Colors.WHITE)
+                name, r = by_ext[ext]
+                if not r["files"]:
+                    results[name] = r
+                r["files"] += 1
+                r["blank"] += b
+                r["comment"] += c
+                r["code"] += k
 
         except KeyboardInterrupt:
             self.was_interrupted = True
 
         return results
 
+    def _analyze_parallel(
+        self, jobs: List[Tuple[str, str]]
+    ) -> Iterator[Tuple[str, int, int, int]]:
+        """Run _analyze_worker over jobs in a process pool, in order."""
+        executor = ProcessPoolExecutor()
+        try:
+            yield from executor.map(_analyze_worker, jobs, chunksize=PARALLEL_CHUNK)
+        except BaseException:
+            # Interrupted or abandoned: don't wait for queued chunks
+            executor.shutdown(wait=False)
+            raise
+        executor.shutdown()
+
+    def _analyze_read_ahead(
+        self, jobs: List[Tuple[str, str]]
+    ) -> Iterator[Tuple[str, int, int, int]]:
+        """Classify files in order while a thread pool reads ahead."""
+        executor = ThreadPoolExecutor(max_workers=READ_AHEAD_THREADS)
+        pending: Deque[Tuple[str, Future]] = deque()
+        try:
+            for full_path, ext in jobs:
+                pending.append((ext, executor.submit(_read_text, full_path)))
+                if len(pending) < READ_AHEAD:
+                    continue
+                ext, future = pending.popleft()
+                yield (ext,) + _analyze_read(future.result(), ext)
+            while pending:
+                ext, future = pending.popleft()
+                yield (ext,) + _analyze_read(future.result(), ext)
+        finally:
+            # Reads still queued after an interrupt are dropped
+            for _, future in pending:
+                future.cancel()
+            executor.shutdown()
+
     def _analyze_file(
         self, filepath: str, lang_def: dict
     ) -> Tuple[int, int, int]:
         """Analyze a single file for blank/comment/code lines."""
-        blank = 0
-        comment = 0
-        code = 0
-        in_block = False
-        single = lang_def.get("single")
-        m_start, m_end = lang_def.get("multi") or (None, None)
-
-        try:
-            with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
-                for line in f:
-                    stripped = line.strip()
-                    if not stripped:
-                        blank += 1
-                        continue
-                    if in_block:
-                        comment += 1
-                        if m_end and m_end in line:
-                            in_block = False
-                        continue
-                    if m_start and stripped.startswith(m_start):
-                        comment += 1
-                        if m_end and m_end not in stripped[len(m_start) :]:
-                            in_block = True
-                        continue
-                    if single and stripped.startswith(single):
-                        comment += 1
-                        continue
-                    code += 1
-        except OSError:
-            return 0, 0, 0
-
-        return blank, comment, code
+        return _analyze_path(filepath, lang_def)
+
+
+def _language_ext(name: str) -> Optional[str]:
+    """
+    Return the LANGUAGES key for a file name, or None (as _iter_files decides).
+    
+    splitext rules apply: leading dots, as in ".py", do not start an extension.
+    """
+    dot = name.rfind(".")
+    if dot <= 0:
+        return None
+    ext = name[dot:].lower()
+    if ext not in LANGUAGES:
+        return None
+    if name[0] == "." and not name[:dot].lstrip("."):
+        return None
+    return ext
+
+
+def _analyze_worker(job: Tuple[str, str]) -> Tuple[str, int, int, int]:
+    """
+    Count one file's lines; top-level so process pools can pickle it.
+    
+    Args:
+        job: (full path, extension key into LANGUAGES)
+    
+    Returns:
+        (extension, blank, comment, code)
+    """
+    full_path, ext = job
+    return (ext,) + _analyze_read(_read_text(full_path), ext)
+
+
+def _analyze_path(filepath: str, lang_def: dict) -> Tuple[int, int, int]:
+    """Analyze a single file for blank/comment/code lines."""
+    text = _read_text(filepath)
+    if text is None:
+        return 0, 0, 0
+    m_start, m_end = lang_def.get("multi") or (None, None)
+    return _analyze_text(text, lang_def.get("single"), m_start, m_end)
+
+
+def _analyze_read(text: Optional[str], ext: str) -> Tuple[int, int, int]:
+    """Classify text returned by _read_text for a LANGUAGES extension."""
+    if text is None:
+        return 0, 0, 0
+    _, _, single, m_start, m_end = LANGUAGES_FAST[ext]
+    return _analyze_text(text, single, m_start, m_end)
+
+
+def _read_text(filepath: str) -> Optional[str]:
+    """
+    Read and decode a whole file, or None if it can't be read.
+    
+    Decoding in one go and splitting with str.splitlines() is cheaper
+    than iterating a text-mode file line by line. Files are read rather
+    than memory-mapped: a mapped file truncated by another process while
+    it is decoded raises SIGBUS, which can't be caught.
+    """
+    try:
+        with open(filepath, "rb") as f:
+            return f.read().decode("utf-8", errors="ignore")
+    except OSError:
+        return None
+
+
+def _analyze_text(
+    text: str,
+    single: Optional[str],
+    m_start: Optional[str],
+    m_end: Optional[str],
+) -> Tuple[int, int, int]:
+    """Classify the lines of already decoded file contents."""
+    if any(brk in text for brk in _EXTRA_LINE_BREAKS):
+        # Keep the \n, \r and \r\n only splitting of text-mode files
+        lines = io.StringIO(text, newline=None).readlines()
+    else:
+        lines = text.splitlines()
+
+    # Pick the narrowest counter for the tokens this file actually uses;
+    # a token that never occurs can't change how any line is classified
+    if single and single not in text:
+        single = None
+    if not (m_start and m_start in text):
+        if single is None:
+            return _count_blank_code(lines)
+        return _count_single(lines, single)
+    return _count_lines(lines, single, m_start, m_end)
+
+
+def _count_blank_code(lines: List[str]) -> Tuple[int, int, int]:
+    """
+    Count a file without comments in bulk, without a per-line loop.
+    
+    A line is blank when it is empty or str.isspace(), the same test as
+    an empty lstrip() in _count_lines.
+    
+    Returns:
+        (blank, 0, code) counts
+    """
+    blank = lines.count("") + sum(map(str.isspace, lines))
+    return blank, 0, len(lines) - blank
+
+
+def _count_single(lines: List[str], single: str) -> Tuple[int, int, int]:
+    """
+    Classify lines of a file that has no block comments.
+    
+    Same results as _count_lines without the block comment state.
+    
+    Returns:
+        (blank, comment, code) counts
+    """
+    blank = 0
+    comment = 0
+    code = 0
+
+    for line in lines:
+        stripped = line.lstrip()
+        if not stripped:
+            blank += 1
+        elif stripped.startswith(single):
+            comment += 1
+        else:
+            code += 1
+
+    return blank, comment, code
+
+
+def _count_lines(
+    lines: Iterable[str],
+    single: Optional[str],
+    m_start: Optional[str],
+    m_end: Optional[str],
+) -> Tuple[int, int, int]:
+    """
+    Classify lines as blank, comment or code.
+    
+    Args:
+        lines: Lines of the file
+        single: Single-line comment token, or None
+        m_start: Block comment opening token, or None
+        m_end: Block comment closing token, or None
+    
+    Returns:
+        (blank, comment, code) counts
+    """
+    blank = 0
+    comment = 0
+    code = 0
+    in_block = False
+    start_len = len(m_start) if m_start else 0
+
+    for line in lines:
+        # Only leading whitespace matters: the checks below are prefix
+        # tests, and tokens never contain whitespace
+        stripped = line.lstrip()
+        if not stripped:
+            blank += 1
+            continue
+        if in_block:
+            comment += 1
+            if m_end and m_end in line:
+                in_block = False
+            continue
+        if m_start and stripped.startswith(m_start):
+            comment += 1
+            if m_end and m_end not in stripped[start_len:]:
+                in_block = True
+            continue
+        if single and stripped.startswith(single):
+            comment += 1
+            continue
+        code += 1
+
+    return blank, comment, code
@@ -128,3 +128,14 @@ LANGUAGES = {
         "multi": ("--[[", "]]"),
     },
 }
+
+# Flat view of LANGUAGES for the per-file hot path: extension ->
+# (name, color, single-line token, block start, block end), None if absent
+LANGUAGES_FAST = {
+    ext: (
+        lang_def["name"],
+        lang_def.get("color", Colors.WHITE),
+        lang_def.get("single"),
+    ) + tuple(lang_def.get("multi") or (None, None))
+    for ext, lang_def in LANGUAGES.items()
+}
@@ -7,21 +7,61 @@ Refactored to use shared core module and single-pass scanning.
 
 from __future__ import annotations
 
-import fnmatch
 import os
 import subprocess
-from typing import Callable, Dict, List, Optional, Set, Tuple
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from functools import lru_cache
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
 
 from gtrmrs.core.colors import Colors
 
 
-from gtrmrs.core.patterns import EXCLUDE_DIRS
+from gtrmrs.core.patterns import EXCLUDE_DIRS_GLOB_RE, EXCLUDE_DIRS_LITERAL
 from gtrmrs.core.git_utils import (
-    is_git_repo,
+    CompiledGitignore,
+    GitCheckIgnoreSession,
+    compile_gitignore_patterns,
+    compile_gitignore_regex,
     git_check_ignore,
+    is_git_repo,
     simple_gitignore_match,
 )
 
+# Paths sent to `git check-ignore` per batch while walking
+CHECK_IGNORE_BATCH = 4096
+
+# Most threads walking top-level subtrees at once (more rarely pays off)
+WALK_THREADS = 4
+
+# Compiled .gitignore files kept across visualizers
+GITIGNORE_CACHE_SIZE = 32
+
+
+@lru_cache(maxsize=GITIGNORE_CACHE_SIZE)
+def _compile_gitignore_file(
+    gitignore_path: str, mtime_ns: int, size: int
+) -> CompiledGitignore:
+    """
+    Compile one .gitignore, once per (path, mtime, size).
+    
+    The stat fields only key the cache: an edited file misses it
+    and is read again.
+    """
+    return compile_gitignore_regex(compile_gitignore_patterns(gitignore_path))
+
+
+def _tree_sort_key(item: Tuple[str, Dict]) -> Tuple[bool, str, str]:
+    """
+    Order tree siblings: directories first, then case-insensitively.
+    
+    The exact name breaks ties between names equal but for case. Key
+    functions run once per item, so each name is lowercased once per sort.
+    """
+    name = item[0]
+    return (not item[1], name.lower(), name)
+
 
 class RepoTreeVisualizer:
     """Generates visual directory trees for Git repositories."""
@@ -39,184 +79,352 @@ class RepoTreeVisualizer:
         self.max_depth = max_depth
         self.use_color = use_color
         self.callback = callback
+        self._walk_cancelled = False
+        # Candidates like "link/" that are symlinks to directories
+        self._symlinked_dirs: Set[str] = set()
         
         # Single pass scan
         self.visible_paths = self._scan_repo()
+        # Nested form of visible_paths, built on first render
+        self._tree: Optional[Tuple[Dict[str, Dict], Set[int]]] = None
 
     def _scan_repo(self) -> Set[str]:
         """Perform a single pass scan to identify all visible files."""
-        # 1. Collect all candidates (respecting eager pruning)
-        all_rel = self._collect_candidates()
-        
         if self.raw_mode:
-            return set(all_rel)
+            return self._collect_candidates()
             
-        # 2. Filter using Git or simple patterns
-        candidates = set(all_rel)
+        # 1. Collect all candidates (respecting eager pruning). In a Git
+        # repository they are streamed to `git check-ignore` meanwhile
         ignored = set()
         
         # Always keep .gitignore if present (and usually .git if raw, but here we handled .git)
         # Note: .git dir itself is usually excluded by logic unless handled specifically
         
+        # 2. Filter using Git or simple patterns
         if is_git_repo(self.repo_path):
-            # Batch check ignore
             # We must pass ALL paths to check-ignore to be safe
-            ignored = git_check_ignore(self.repo_path, list(candidates))
+            candidates, ignored = self._collect_checked_candidates()
         else:
+            candidates = self._collect_candidates()
             # Fallback simple matching
             ignore_patterns = self._read_and_compile_gitignore()
-            for path in candidates:
-                # directory check logic
-                is_dir = path.endswith("/") # Our collect adds trailing slash to dirs? 
-                # wait, collect logic needs to be consistent
-                # let's assume collect returns "foo/bar" for file and "foo/" for dir?
-                
-                # Using simple_gitignore_match
-                if simple_gitignore_match(path.rstrip("/"), ignore_patterns, path.endswith("/")):
-                     ignored.add(path)
+            # Every rule has a directory form, not every rule a file form
+            if ignore_patterns.dir_re is not None:
+                for path in candidates:
+                    # Directories are collected as "foo/", files as "foo/bar"
+                    is_dir = path.endswith("/")
+                    if simple_gitignore_match(
+                        path[:-1] if is_dir else path, ignore_patterns, is_dir
+                    ):
+                        ignored.add(path)
 
-        # 3. Apply filter
-        visible = candidates - ignored
+        # 3. Apply filter in place: candidates is ours alone, so there is
+        # no need to copy it into a fresh set
+        candidates -= ignored
+        visible = candidates
         
-        # Ensure .gitignore is visible if it exists (standard practice)
-        if os.path.isfile(os.path.join(self.repo_path, ".gitignore")):
+        # Ensure .gitignore is visible if it exists (standard practice);
+        # the walk usually found it already, sparing the stat
+        if ".gitignore" not in visible and os.path.isfile(
+            os.path.join(self.repo_path, ".gitignore")
+        ):
             visible.add(".gitignore")
             
         return visible
 
-    def _collect_candidates(self) -> List[str]:
+    def _collect_checked_candidates(self) -> Tuple[Set[str], Set[str]]:
+        """
+        Collect candidates and find the ones `git check-ignore` ignores.
+        
+        Directories are streamed to Git while the walk runs. Git only
+        reports a directory when nothing below it is tracked, so
+        everything under an ignored directory is ignored too, and only
+        the remaining files need a second check. Symlinked directories
+        go with the files, without their trailing slash: Git refuses
+        paths "beyond a symbolic link" and would abort the whole check.
+        
+        Returns:
+            (all candidates, those ignored by Git)
+        """
+        candidates: Set[str] = set()
+        files: List[str] = []
+        batch: List[str] = []
+        session = GitCheckIgnoreSession(self.repo_path)
+        session.start()
+        try:
+            for path in self._iter_candidates():
+                candidates.add(path)
+                if not path.endswith("/"):
+                    files.append(path)
+                    continue
+                if path in self._symlinked_dirs:
+                    files.append(path[:-1])
+                    continue
+                batch.append(path)
+                if len(batch) >= CHECK_IGNORE_BATCH:
+                    session.add(batch)
+                    batch = []
+            session.add(batch)
+        finally:
+            ignored_dirs = session.close()
+        
+        if not ignored_dirs:
+            return candidates, self._check_files(files)
+        
+        # Relative dir ("" or ending in "/") -> inside an ignored directory?
+        blocked: Dict[str, bool] = {"": False}
+        
+        def _is_blocked(rel_dir: str) -> bool:
+            result = blocked.get(rel_dir)
+            if result is None:
+                parent = rel_dir[:rel_dir.rfind("/", 0, -1) + 1]
+                result = rel_dir in ignored_dirs or _is_blocked(parent)
+                blocked[rel_dir] = result
+            return result
+        
+        # Git reports every directory it ignores, nested ones included
+        ignored = set(ignored_dirs)
+        residual = []
+        for path in files:
+            if _is_blocked(path[:path.rfind("/") + 1]):
+                ignored.add(path)
+            else:
+                residual.append(path)
+        ignored |= self._check_files(residual)
+        return candidates, ignored
+
+    def _check_files(self, paths: List[str]) -> Set[str]:
+        """Run `git check-ignore` on non-directory candidate paths."""
+        ignored = git_check_ignore(self.repo_path, paths)
+        for path in self._symlinked_dirs:
+            # Sent without the trailing slash; report it as listed
+            if path[:-1] in ignored:
+                ignored.discard(path[:-1])
+                ignored.add(path)
+        return ignored
+
+    def _collect_candidates(self) -> Set[str]:
         """Walk file system and collect candidates (eager pruning)."""
-        candidates = []
+        return set(self._iter_candidates())
+
+    def _iter_candidates(self) -> Iterator[str]:
+        """
+        Walk file system and yield candidates (eager pruning).
+        
+        With more than one CPU, the subtrees below the top-level
+        directories are walked on a thread pool: scandir releases the GIL,
+        so their listings overlap. The callback only runs on this thread.
+        """
+        root = (self.repo_path, "", 0)
+        workers = min(WALK_THREADS, os.cpu_count() or 1)
+        if workers <= 1:
+            yield from self._walk([root], self.callback)
+            return
+        
+        top_dirs: List[Tuple[str, str, int]] = []
+        yield from self._walk([root], self.callback, top_dirs)
+        if not top_dirs:
+            return
+        
+        self._walk_cancelled = False
+        executor = ThreadPoolExecutor(max_workers=min(workers, len(top_dirs)))
+        futures = [
+            executor.submit(lambda top: list(self._walk([top])), top) for top in top_dirs
+        ]
         try:
-            for dirpath, dirnames, filenames in os.walk(self.repo_path, topdown=True):
-                # Callback
-                if self.callback:
-                    # Provide feedback on progress
-                    self.callback(dirpath)
+            for (dir_path, _, _), future in zip(top_dirs, futures):
+                while True:
+                    try:
+                        paths = future.result(timeout=0.1)
+                        break
+                    except FutureTimeoutError:
+                        if self.callback:
+                            self.callback(dir_path)
+                yield from paths
+        finally:
+            # Interrupted or abandoned: stop workers at their next directory
+            self._walk_cancelled = True
+            for future in futures:
+                future.cancel()
+            executor.shutdown()
+
+    def _walk(
+        self,
+        stack: List[Tuple[str, str, int]],
+        callback: Optional[Callable[..., None]] = None,
+        subdirs: Optional[List[Tuple[str, str, int]]] = None,
+    ) -> Iterator[str]:
+        """
+        Yield candidates below the (path, rel_dir, depth) entries in `stack`.
+        
+        Directories are listed with os.scandir, whose DirEntry objects
+        answer is_dir() from the directory listing itself. As with
+        os.walk, symlinked directories are listed but not entered. With
+        `subdirs`, directories to enter are appended there instead of
+        being walked.
+        """
+        raw_mode = self.raw_mode
+        max_depth = self.max_depth
+        pending = stack if subdirs is None else subdirs
+        # Bound once: the glob union's match method, not fnmatch per name
+        exclude_match = (
+            EXCLUDE_DIRS_GLOB_RE.match if EXCLUDE_DIRS_GLOB_RE is not None else None
+        )
+        
+        while stack:
+            if self._walk_cancelled:
+                return
+            dir_path, rel_dir, depth = stack.pop()
+            # Check depth
+            if max_depth > -1 and depth >= max_depth:
+                continue
+            try:
+                with os.scandir(dir_path) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+            
+            # Callback
+            if callback:
+                # Provide feedback on progress
+                callback(dir_path)
+            
+            for entry in entries:
+                name = entry.name
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
                 
-                rel_dir = os.path.relpath(dirpath, self.repo_path)
-                if rel_dir == ".":
-                    rel_dir = ""
-                else:
-                    rel_dir = rel_dir.replace(os.sep, "/")
+                if not is_dir:
+                    yield rel_dir + name
+                    continue
                 
-                # Check depth
-                depth = 0 if not rel_dir else rel_dir.count("/") + 1
-                if self.max_depth > -1 and depth >= self.max_depth:
-                    dirnames[:] = []
-                    filenames[:] = []
+                if name == ".git":
+                    # We generally hide .git content unless raw mode? 
+                    # Actually standard rtree shows .git/ folder but not contents usually
+                    # Logic: if raw_mode, show .git. If not, hide it.
+                    if raw_mode:
+                        yield f"{rel_dir}{name}/"
                     continue
-
-                # Eager Pruning
-                active_dirs = []
-                for d in dirnames:
-                    if d == ".git":
-                        # We generally hide .git content unless raw mode? 
-                        # Actually standard rtree shows .git/ folder but not contents usually
-                        # Logic: if raw_mode, show .git. If not, hide it.
-                        if self.raw_mode:
-                            candidates.append((rel_dir + "/" + d + "/") if rel_dir else d + "/")
-                        continue
-                        
-                    if not self.raw_mode:
-                        # Check EXCLUDE_DIRS
-                        if any(fnmatch.fnmatch(d, p) for p in EXCLUDE_DIRS):
-                            continue
                     
-                    active_dirs.append(d)
-                    path_str = (rel_dir + "/" + d + "/") if rel_dir else d + "/"
-                    candidates.append(path_str)
-                
-                dirnames[:] = active_dirs
+                if not raw_mode:
+                    # Check EXCLUDE_DIRS: set lookup, then one glob union
+                    if name in EXCLUDE_DIRS_LITERAL or (
+                        exclude_match is not None and exclude_match(name)
+                    ):
+                        continue
                 
-                for f in filenames:
-                    path_str = (rel_dir + "/" + f) if rel_dir else f
-                    candidates.append(path_str)
-                    
-        except OSError:
-            pass
-            
-        return candidates
+                # One f-string builds the path without an intermediate
+                # rel_dir + name string
+                path_str = f"{rel_dir}{name}/"
+                yield path_str
+                if entry.is_symlink():
+                    self._symlinked_dirs.add(path_str)
+                else:
+                    pending.append((entry.path, path_str, depth + 1))
 
-    def _read_and_compile_gitignore(self) -> List[Tuple[str, bool, bool]]:
-        """Read .gitignore and return compiled patterns."""
-        path = os.path.join(self.repo_path, ".gitignore")
-        if not os.path.isfile(path):
-            return []
-            
-        patterns = []
+    def _read_and_compile_gitignore(self) -> CompiledGitignore:
+        """
+        Read .gitignore and compile it for simple_gitignore_match().
+        
+        All rules become one regex union per path type, so each path is
+        checked with a single match. Repeat visualizers of an unchanged
+        file reuse the compiled result.
+        """
+        gitignore_path = os.path.join(self.repo_path, ".gitignore")
         try:
-            with open(path, "r", encoding="utf-8", errors="ignore") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line or line.startswith("#"):
-                        continue
-                    
-                    # Compile simple logic (same as engine logic)
-                    is_dir = line.endswith("/")
-                    if is_dir: line = line[:-1]
-                    anchored = line.startswith("/")
-                    if anchored: line = line[1:]
-                    line = line.replace("\\", "/")
-                    patterns.append((line, is_dir, anchored))
+            st = os.stat(gitignore_path)
         except OSError:
-            pass
-        return patterns
+            return compile_gitignore_regex([])
+        return _compile_gitignore_file(gitignore_path, st.st_mtime_ns, st.st_size)
+
+    def _build_tree(self) -> Tuple[Dict[str, Dict], Set[int]]:
+        """
+        Nest the visible paths into dicts, once per visualizer.
+        
+        Paths are inserted in set order: children are sorted when
+        rendered, so sorting every full path up front buys nothing.
+        Names are interned, so the many repeats across a big tree
+        ("src", "__init__.py", "index.js") share one string each.
+        
+        Returns:
+            (tree, ids of the nodes listed as directories)
+        """
+        if self._tree is None:
+            tree: Dict[str, Dict] = {}
+            # Nodes listed as directories ("foo/"), so empty ones still
+            # render as directories; keyed by id() since nodes are dicts
+            dir_nodes: Set[int] = set()
+            
+            intern = sys.intern
+            for path in self.visible_paths:
+                is_dir = path.endswith("/")
+                node = tree
+                for p in (path[:-1] if is_dir else path).split("/"):
+                    child = node.get(p)
+                    if child is None:
+                        child = node[intern(p)] = {}
+                    node = child
+                if is_dir:
+                    dir_nodes.add(id(node))
+            self._tree = (tree, dir_nodes)
+        return self._tree
 
     def get_ascii_tree(self) -> List[str]:
         """Generate ASCII tree from cached visible paths."""
+        tree, dir_nodes = self._build_tree()
         
-        # Build dict
-        tree: Dict[str, Dict] = {}
-        
-        # Sort paths to ensure parents process before children? 
-        # Actually dict update works fine regardless of order if we use setdefault
-        
-        for path in sorted(self.visible_paths):
-            path = path.rstrip("/")
-            parts = path.split("/")
-            node = tree
-            for p in parts:
-                node = node.setdefault(p, {})
-        
-        def _render_ascii(node: Dict, prefix: str = "", current_path: str = "") -> List[str]:
-            items = sorted(node.items(), key=lambda x: (len(x[1]) == 0, x[0].lower()))
-            lines = []
-            for idx, (name, child) in enumerate(items):
-                is_last = idx == len(items) - 1
-                connector = "└── " if is_last else "├── "
-                
-                # Determine type
-                rel_path = (current_path + "/" + name) if current_path else name
-                # It is a directory if it has children OR if explicitly in our set as a dir
-                is_dir = len(child) > 0 or (rel_path + "/") in self.visible_paths
-                
-                if name == ".git" or is_dir:
-                    colored_name = Colors.style(name + "/", Colors.BLUE, self.use_color)
-                elif name == ".gitignore":
-                     colored_name = Colors.style(name, Colors.YELLOW, self.use_color)
-                else:
-                     colored_name = Colors.style(name, Colors.GREEN, self.use_color)
-
-                lines.append(prefix + connector + colored_name)
-                
-                if child:
-                    extension = "    " if is_last else "│   "
-                    lines.extend(_render_ascii(child, prefix + extension, rel_path))
-            return lines
+        def _sorted_items(node: Dict) -> List[Tuple[str, Dict]]:
+            return sorted(node.items(), key=_tree_sort_key)
 
         header = Colors.style(
             os.path.basename(self.repo_path) + "/",
             Colors.BLUE + Colors.BOLD,
             self.use_color,
         )
-        return [header] + _render_ascii(tree)
+        lines = [header]
+        dir_start, dir_end = Colors.codes(Colors.BLUE, self.use_color)
+        ign_start, ign_end = Colors.codes(Colors.YELLOW, self.use_color)
+        file_start, file_end = Colors.codes(Colors.GREEN, self.use_color)
+        
+        # Depth-first without recursion: each entry is a sorted sibling
+        # list, the index of the next sibling to render, and its prefix
+        stack: List[Tuple[List[Tuple[str, Dict]], int, str]] = [(_sorted_items(tree), 0, "")]
+        while stack:
+            items, idx, prefix = stack.pop()
+            if idx >= len(items):
+                continue
+            name, child = items[idx]
+            is_last = idx == len(items) - 1
+            if not is_last:
+                stack.append((items, idx + 1, prefix))
+            connector = "└── " if is_last else "├── "
+            
+            # It is a directory if it has children OR if flagged while
+            # nesting; no path is rebuilt to probe visible_paths
+            is_dir = bool(child) or id(child) in dir_nodes
+            
+            if name == ".git" or is_dir:
+                colored_name = dir_start + name + "/" + dir_end
+            elif name == ".gitignore":
+                colored_name = ign_start + name + ign_end
+            else:
+                colored_name = file_start + name + file_end
+
+            lines.append(prefix + connector + colored_name)
+            
+            if child:
+                # Pushed last, so the subtree renders before the next sibling
+                extension = "    " if is_last else "│   "
+                stack.append((_sorted_items(child), 0, prefix + extension))
+
+        return lines
 
     def get_flat_list(self) -> List[str]:
         """Generate sorted flat list."""
-        # Just sort the cache!
-        # Files first or dirs first? 
-        # The previous implementation mixed them but generally breadth-first or directory order?
-        # Actually standard simple sort is fine for a flat list usually.
-        # But let's try to match: dirs have trailing slash.
-        return sorted(list(self.visible_paths))
+        # A single sort of the visible set beats merging per-directory
+        # sorted chunks with heapq.merge, whose Python-level comparisons
+        # cost more than the C sort they replace. Sort the set directly
+        # rather than copying it into an intermediate list first.
+        return sorted(self.visible_paths)
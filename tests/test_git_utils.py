@@ -0,0 +1,233 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+from gtrmrs.core.git_utils import (
+    GitignoreMatcher,
+    collect_files_with_pruning,
+    compile_gitignore_regex,
+    gitignore_literal_extensions,
+    should_eager_prune,
+    simple_gitignore_match,
+)
+
+
+class TestEagerPrune(unittest.TestCase):
+    def test_default_excludes(self):
+        self.assertTrue(should_eager_prune("node_modules"))
+        self.assertTrue(should_eager_prune("gtrmrs.egg-info"))
+        self.assertFalse(should_eager_prune("src"))
+
+    def test_extra_excludes(self):
+        self.assertTrue(should_eager_prune("docs", ["docs/"]))
+        self.assertTrue(should_eager_prune("tmp1", ["tmp*"]))
+        self.assertFalse(should_eager_prune("docs", ["tmp*"]))
+
+
+class TestGitignoreRegex(unittest.TestCase):
+    PATTERNS = [
+        ("*.log", False, False),
+        ("keep.log", True, False),
+        ("build", False, True),
+    ]
+
+    def test_compiled_matches_tuple_fallback(self):
+        compiled = compile_gitignore_regex(self.PATTERNS)
+        cases = [
+            ("app.log", False),
+            ("sub/app.log", False),
+            ("sub/keep.log", False),
+            ("build", True),
+            ("build", False),
+            ("src/main.py", False),
+        ]
+        for relpath, is_dir in cases:
+            self.assertEqual(
+                simple_gitignore_match(relpath, compiled, is_dir),
+                simple_gitignore_match(relpath, self.PATTERNS, is_dir),
+                relpath,
+            )
+
+    def test_last_rule_wins(self):
+        compiled = compile_gitignore_regex(self.PATTERNS)
+        self.assertTrue(simple_gitignore_match("a/app.log", compiled))
+        self.assertFalse(simple_gitignore_match("a/keep.log", compiled))
+
+    def test_dir_only_rules(self):
+        compiled = compile_gitignore_regex(self.PATTERNS)
+        self.assertTrue(simple_gitignore_match("build", compiled, is_dir=True))
+        self.assertFalse(simple_gitignore_match("build", compiled, is_dir=False))
+
+    def test_wildmatch_rules(self):
+        compiled = compile_gitignore_regex([
+            ("/top.txt", False, False),
+            ("doc/*.md", False, False),
+            ("lib/**/gen", False, False),
+            ("out", False, True),
+        ])
+        self.assertTrue(simple_gitignore_match("top.txt", compiled))
+        self.assertFalse(simple_gitignore_match("sub/top.txt", compiled))
+        self.assertTrue(simple_gitignore_match("doc/a.md", compiled))
+        self.assertFalse(simple_gitignore_match("doc/x/a.md", compiled))
+        self.assertTrue(simple_gitignore_match("lib/a/b/gen", compiled))
+        # A matched directory covers everything below it
+        self.assertTrue(simple_gitignore_match("src/out/x.py", compiled))
+        self.assertFalse(simple_gitignore_match("out", compiled, is_dir=False))
+
+    def test_negation_stays_above_excluded_dirs(self):
+        # Git cannot re-include a path whose parent directory is excluded
+        compiled = compile_gitignore_regex([("*", False, False), ("a.txt", True, False)])
+        self.assertFalse(simple_gitignore_match("a.txt", compiled))
+        self.assertTrue(simple_gitignore_match("a.txt/bar", compiled))
+        compiled = compile_gitignore_regex([("build", False, True), ("build/keep", True, False)])
+        self.assertTrue(simple_gitignore_match("build/keep", compiled))
+        self.assertTrue(simple_gitignore_match("build/keep", compiled, is_dir=True))
+
+    def test_negated_dir_keeps_children(self):
+        compiled = compile_gitignore_regex([("build", False, False), ("*", True, True)])
+        self.assertFalse(simple_gitignore_match("build", compiled, is_dir=True))
+        self.assertFalse(simple_gitignore_match("build/x.py", compiled))
+        self.assertTrue(simple_gitignore_match("build", compiled))
+
+    def test_bracket_expressions(self):
+        compiled = compile_gitignore_regex([
+            ("[[:upper:]]*.py", False, False),
+            ("a[!b]c", False, False),
+            ("x[[:digit:]]", False, False),
+            ("[z-a]q", False, False),
+            ("[abc", False, False),
+        ])
+        self.assertTrue(simple_gitignore_match("Junk.py", compiled))
+        self.assertFalse(simple_gitignore_match("junk.py", compiled))
+        self.assertTrue(simple_gitignore_match("axc", compiled))
+        self.assertFalse(simple_gitignore_match("abc", compiled))
+        # No class matches the path separator
+        self.assertFalse(simple_gitignore_match("a/c", compiled))
+        self.assertTrue(simple_gitignore_match("x1", compiled))
+        self.assertFalse(simple_gitignore_match("x]", compiled))
+        # A reversed range is empty; the bracket before it still counts
+        self.assertTrue(simple_gitignore_match("zq", compiled))
+        self.assertFalse(simple_gitignore_match("mq", compiled))
+        # An unterminated bracket matches nothing
+        self.assertFalse(simple_gitignore_match("[abc", compiled))
+
+    def test_literal_extensions(self):
+        exts = gitignore_literal_extensions([("*.log", False, False), ("*.py[cod]", False, False)])
+        self.assertEqual(exts, frozenset({"log"}))
+        self.assertEqual(gitignore_literal_extensions(self.PATTERNS), frozenset())
+
+
+class TestGitignoreMatcher(unittest.TestCase):
+    def test_nested_rules(self):
+        with tempfile.TemporaryDirectory() as root:
+            os.makedirs(os.path.join(root, "sub"))
+            with open(os.path.join(root, ".gitignore"), "w", encoding="utf-8") as f:
+                f.write("*.tmp\n/top.txt\n")
+            with open(os.path.join(root, "sub", ".gitignore"), "w", encoding="utf-8") as f:
+                f.write("!keep.tmp\nlocal/\n")
+            
+            matcher = GitignoreMatcher(root, git_excludes=False)
+            sub = "sub" + os.sep
+            matcher.load_dir(sub)
+            self.assertTrue(matcher.match("a.tmp"))
+            self.assertTrue(matcher.match(sub + "a.tmp"))
+            self.assertFalse(matcher.match(sub + "keep.tmp"))
+            self.assertTrue(matcher.match("top.txt"))
+            self.assertFalse(matcher.match(sub + "top.txt"))
+            self.assertTrue(matcher.match(sub + "local", is_dir=True))
+            self.assertFalse(matcher.match("local", is_dir=True))
+
+    def test_exact_flag(self):
+        with tempfile.TemporaryDirectory() as root:
+            with open(os.path.join(root, ".gitignore"), "w", encoding="utf-8") as f:
+                f.write("**/gen\n/build/\n")
+            for sub, rules in (("esc", "\\#notes\n"), ("neg", "*.tmp\n!keep.tmp\n")):
+                os.makedirs(os.path.join(root, sub))
+                with open(os.path.join(root, sub, ".gitignore"), "w", encoding="utf-8") as f:
+                    f.write(rules)
+                
+                matcher = GitignoreMatcher(root, git_excludes=False)
+                self.assertTrue(matcher.exact)
+                matcher.load_dir(sub + os.sep)
+                self.assertFalse(matcher.exact, sub)
+
+
+class TestCollectFiles(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = self.tmp.name
+        for rel in ("a.py", "src/b.py", "src/deep/c.py", "node_modules/x.js", "out.log"):
+            path = os.path.join(root, *rel.split("/"))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("x\n")
+        with open(os.path.join(root, ".gitignore"), "w", encoding="utf-8") as f:
+            f.write("*.log\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_prunes_and_ignores(self):
+        relpaths, ignored = collect_files_with_pruning(self.tmp.name)
+        self.assertIn(os.path.join("src", "deep", "c.py"), relpaths)
+        self.assertIn("src" + os.sep, relpaths)
+        self.assertNotIn(os.path.join("node_modules", "x.js"), relpaths)
+        self.assertEqual(ignored, {"out.log"})
+
+    def test_max_depth(self):
+        relpaths, _ = collect_files_with_pruning(self.tmp.name, raw_mode=True, max_depth=1)
+        self.assertIn("a.py", relpaths)
+        self.assertIn("node_modules" + os.sep, relpaths)
+        self.assertNotIn(os.path.join("src", "b.py"), relpaths)
+
+    @unittest.skipIf(not hasattr(os, "symlink") or os.name == "nt", "needs symlinks")
+    def test_symlinked_dirs(self):
+        root = self.tmp.name
+        os.symlink(os.path.join(root, "src"), os.path.join(root, "lnk"))
+        os.makedirs(os.path.join(root, "pkg"))
+        os.symlink(
+            os.path.join(root, "node_modules"), os.path.join(root, "pkg", "node_modules")
+        )
+        relpaths, _ = collect_files_with_pruning(root, raw_mode=True)
+        self.assertIn("lnk" + os.sep, relpaths)
+        self.assertNotIn(os.path.join("lnk", "b.py"), relpaths)
+
+        relpaths, _ = collect_files_with_pruning(root)
+        self.assertNotIn(os.path.join("pkg", "node_modules"), relpaths)
+        self.assertNotIn(os.path.join("pkg", "node_modules") + os.sep, relpaths)
+
+
+@unittest.skipIf(shutil.which("git") is None, "git is not installed")
+class TestExtensionShortcut(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = self.tmp.name
+        subprocess.run(["git", "init", "-q", root], check=True)
+        files = {
+            ".gitignore": "*.log\n",
+            "log": "x\n",
+            "out.log": "x\n",
+            "kept.log": "x\n",
+            "sub/.gitignore": "!local.log\n",
+            "sub/local.log": "x\n",
+            "sub/other.log": "x\n",
+        }
+        for rel, text in files.items():
+            path = os.path.join(root, *rel.split("/"))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+        subprocess.run(["git", "-C", root, "add", "-f", "kept.log"], check=True)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_matches_git(self):
+        _, ignored = collect_files_with_pruning(self.tmp.name)
+        self.assertEqual(ignored, {"out.log", os.path.join("sub", "other.log")})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+from gtrmrs.gitmig.engine import GitMigEngine
+
+
+@unittest.skipIf(shutil.which("git") is None, "git is not installed")
+class TestScanRepo(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.src = os.path.join(self.tmp.name, "src")
+        self.repo = os.path.join(self.src, "repo")
+        subprocess.run(["git", "init", "-q", self.repo], check=True)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, rel: str, text: str = "x\n") -> None:
+        path = os.path.join(self.repo, *rel.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def _copied(self):
+        engine = GitMigEngine(
+            self.src, os.path.join(self.tmp.name, "dst"), dry_run=True, quiet=True
+        )
+        files, _ = engine._scan_repo("repo", self.repo)
+        return {rel.replace(os.sep, "/") for rel, _ in files}
+
+    def test_ignorecase_rules_go_to_git(self):
+        subprocess.run(
+            ["git", "-C", self.repo, "config", "core.ignorecase", "true"], check=True
+        )
+        self._write(".gitignore", "GEN/\n")
+        self._write("gen/a.txt")
+        self._write("main.py")
+
+        copied = self._copied()
+        self.assertIn("main.py", copied)
+        self.assertNotIn("gen/a.txt", copied)
+
+    def test_kept_ignored_dir_confirms_its_files(self):
+        # assets/ holds a tracked file, so Git keeps the directory and only
+        # ignores its untracked files, which no negation can re-include
+        self._write(".gitignore", "assets/\n!*.md\n")
+        self._write("assets/keep.txt")
+        self._write("assets/notes.md")
+        self._write("assets/out.txt")
+        subprocess.run(
+            ["git", "-C", self.repo, "add", "-f", "assets/keep.txt"], check=True
+        )
+
+        copied = self._copied()
+        self.assertIn("assets/keep.txt", copied)
+        self.assertNotIn("assets/notes.md", copied)
+        self.assertNotIn("assets/out.txt", copied)
+
+
+class TestCopyFile(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.engine = GitMigEngine(
+            self.tmp.name, os.path.join(self.tmp.name, "dst"), quiet=True
+        )
+        self.old_umask = os.umask(0o022)
+
+    def tearDown(self):
+        os.umask(self.old_umask)
+        self.tmp.cleanup()
+
+    def _file(self, name: str, mode: int) -> str:
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("x\n")
+        os.chmod(path, mode)
+        return path
+
+    def _copy(self, src: str, dst: str) -> int:
+        self.engine._copy_file(src, dst, os.path.getsize(src))
+        return os.stat(dst).st_mode & 0o777
+
+    @unittest.skipIf(os.name == "nt", "POSIX permission bits")
+    def test_overwrite_takes_source_mode(self):
+        src = self._file("run.sh", 0o775)
+        dst = self._file("old.sh", 0o644)
+
+        self.assertEqual(self._copy(src, dst), 0o775)
+
+    @unittest.skipIf(os.name == "nt", "POSIX permission bits")
+    def test_new_file_ignores_umask(self):
+        src = self._file("data.txt", 0o664)
+
+        self.assertEqual(self._copy(src, os.path.join(self.tmp.name, "new.txt")), 0o664)
+
+
+if __name__ == "__main__":
+    unittest.main()
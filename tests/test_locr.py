@@ -0,0 +1,75 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+from gtrmrs.locr.engine import LocrEngine
+
+
+@unittest.skipIf(shutil.which("git") is None, "git is not installed")
+class TestCollectFiles(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.repo = self.tmp.name
+        subprocess.run(["git", "init", "-q", self.repo], check=True)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, rel: str, text: str = "x = 1\n") -> None:
+        path = os.path.join(self.repo, *rel.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def _counted(self):
+        files = LocrEngine(self.repo)._collect_and_filter_files()
+        return {rel_path for rel_path, _, _ in files}
+
+    def test_tracked_files_under_ignored_rules(self):
+        self._write(".gitignore", "gen/\n*.tmp.py\n")
+        self._write("gen/kept.py")
+        self._write("gen/out.py")
+        self._write("src/kept.tmp.py")
+        self._write("src/main.py")
+        subprocess.run(
+            ["git", "-C", self.repo, "add", "-f", "gen/kept.py", "src/kept.tmp.py"],
+            check=True,
+        )
+
+        self.assertEqual(
+            self._counted(), {"gen/kept.py", "src/kept.tmp.py", "src/main.py"}
+        )
+
+    def test_posix_class_rules_go_to_git(self):
+        self._write(".gitignore", "[[:upper:]]*.py\n")
+        self._write("Junk.py")
+        self._write("main.py")
+
+        self.assertEqual(self._counted(), {"main.py"})
+
+    def test_leading_whitespace_is_kept(self):
+        # Git reads " main.py" literally, so main.py stays counted
+        self._write(".gitignore", " main.py\n")
+        self._write("main.py")
+
+        self.assertEqual(self._counted(), {"main.py"})
+
+    def test_included_excludes_file(self):
+        excludes = os.path.join(self.repo, ".git", "extra-ignore")
+        with open(excludes, "w", encoding="utf-8") as f:
+            f.write("junk.py\n")
+        with open(os.path.join(self.repo, ".git", "extra.cfg"), "w", encoding="utf-8") as f:
+            f.write("[core]\n\texcludesFile = %s\n" % excludes)
+        subprocess.run(
+            ["git", "-C", self.repo, "config", "include.path", "extra.cfg"], check=True
+        )
+        self._write("junk.py")
+        self._write("main.py")
+
+        self.assertEqual(self._counted(), {"main.py"})
+
+
+if __name__ == "__main__":
+    unittest.main()